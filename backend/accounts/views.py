@@ -2,10 +2,8 @@ from rest_framework import status
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from .models import Interest
-from .constants import DEFAULT_INTERESTS
+from learning import catalog
 from .serializers import (
-    InterestSerializer,
     RegisterSerializer,
     UserProfileSerializer,
     LoginSerializer,
@@ -16,13 +14,7 @@ class InterestListView(APIView):
     permission_classes = [AllowAny]
 
     def get(self, request):
-        if not Interest.objects.exists():
-            Interest.objects.bulk_create(
-                [Interest(name=name) for name in DEFAULT_INTERESTS],
-                ignore_conflicts=True,
-            )
-        interests = Interest.objects.all().order_by('name')
-        return Response(InterestSerializer(interests, many=True).data)
+        return Response(catalog.interests())
 
 
 class RegisterView(APIView):
@@ -1,5 +1,11 @@
 import os
+from django.conf import settings
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 application = get_asgi_application()
+
+if settings.ML_EAGER_LOAD:
+    from recommendations.ml_engine import warm_up
+
+    warm_up()
@@ -1,4 +1,5 @@
 import os
+import tempfile
 from pathlib import Path
 from datetime import timedelta
 from dotenv import load_dotenv
@@ -25,9 +26,13 @@ INSTALLED_APPS = [
     'learning',
     'recommendations',
     'roadmaps',
+    'jobs',
+    'monitoring',
 ]
 
 MIDDLEWARE = [
+    'monitoring.middleware.MetricsMiddleware',
+    'monitoring.middleware.QueryStatsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
@@ -65,6 +70,10 @@ if DB_ENGINE == 'sqlite':
         'default': {
             'ENGINE': 'django.db.backends.sqlite3',
             'NAME': BASE_DIR / 'db.sqlite3',
+            'OPTIONS': {
+                'transaction_mode': 'IMMEDIATE',
+                'timeout': 20,
+            },
         }
     }
 else:
@@ -82,6 +91,14 @@ else:
         }
     }
 
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.filebased.FileBasedCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION') or str(Path(tempfile.gettempdir()) / 'erudition_cache'),
+        'OPTIONS': {'MAX_ENTRIES': int(os.getenv('CACHE_MAX_ENTRIES', '20000'))},
+    }
+}
+
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
     {'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator'},
@@ -117,5 +134,26 @@ CORS_ALLOWED_ORIGINS = [origin.strip() for origin in os.getenv('CORS_ALLOWED_ORI
 
 ASSESSMENT_TOTAL_QUESTIONS = int(os.getenv('ASSESSMENT_TOTAL_QUESTIONS', '10'))
 FINAL_ASSESSMENT_QUESTIONS = 10
+FINAL_FORMS_PER_COURSE = int(os.getenv('FINAL_FORMS_PER_COURSE', '4'))
+QUESTION_POOL_CHECK_INTERVAL = float(os.getenv('QUESTION_POOL_CHECK_INTERVAL', '5'))
+IRT_SE_THRESHOLD = float(os.getenv('IRT_SE_THRESHOLD', '0.6'))
+IRT_MIN_QUESTIONS = int(os.getenv('IRT_MIN_QUESTIONS', '5'))
+IRT_RANDOMESQUE = int(os.getenv('IRT_RANDOMESQUE', '3'))
+ASSESSMENT_SESSION_TTL = int(os.getenv('ASSESSMENT_SESSION_TTL', '7200'))
+ASSESSMENT_ASYNC_FINALIZE = os.getenv('ASSESSMENT_ASYNC_FINALIZE', 'False').lower() == 'true'
+JOBS_VISIBILITY_TIMEOUT = int(os.getenv('JOBS_VISIBILITY_TIMEOUT', '300'))
+JOBS_MAX_ATTEMPTS = int(os.getenv('JOBS_MAX_ATTEMPTS', '5'))
+QUERY_STATS_SAMPLE_RATE = float(os.getenv('QUERY_STATS_SAMPLE_RATE', '0.1'))
+QUERY_STATS_WINDOW = int(os.getenv('QUERY_STATS_WINDOW', '200'))
+QUERY_STATS_REPEAT_THRESHOLD = int(os.getenv('QUERY_STATS_REPEAT_THRESHOLD', '3'))
+METRICS_DIR = os.getenv('METRICS_DIR') or str(Path(tempfile.gettempdir()) / 'erudition_metrics')
+METRICS_FLUSH_INTERVAL = float(os.getenv('METRICS_FLUSH_INTERVAL', '1'))
 TARGET_TIME_PER_QUESTION = float(os.getenv('TARGET_TIME_PER_QUESTION', '20'))
 ML_ARTIFACT_DIR = os.getenv('ML_ARTIFACT_DIR', str((BASE_DIR.parent / 'ml' / 'artifacts').resolve()))
+ML_EAGER_LOAD = os.getenv('ML_EAGER_LOAD', 'True').lower() == 'true'
+ML_RELOAD_INTERVAL = float(os.getenv('ML_RELOAD_INTERVAL', '30'))
+ML_NEIGHBOR_CELL_BUDGET = float(os.getenv('ML_NEIGHBOR_CELL_BUDGET', '8'))
+LEARNER_HISTORY_DIR = os.getenv('LEARNER_HISTORY_DIR') or str((BASE_DIR.parent / 'dataset' / 'production_history').resolve())
+RECOMMENDATION_CACHE_SIZE = int(os.getenv('RECOMMENDATION_CACHE_SIZE', '4096'))
+RECOMMENDATION_CACHE_TTL = float(os.getenv('RECOMMENDATION_CACHE_TTL', '3600'))
+RECOMMENDATION_TIME_STEP = float(os.getenv('RECOMMENDATION_TIME_STEP', '0.5'))
@@ -0,0 +1,33 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from jobs.queue import run_pending
+
+
+class Command(BaseCommand):
+    help = 'Run the database-backed background job worker.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Process available jobs and exit.')
+        parser.add_argument('--poll-interval', type=float, default=1.0, help='Seconds to sleep when the queue is empty.')
+        parser.add_argument(
+            '--visibility-timeout',
+            type=int,
+            default=settings.JOBS_VISIBILITY_TIMEOUT,
+            help='Seconds a claimed job stays invisible to other workers.',
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.SUCCESS('Job worker started.'))
+        try:
+            while True:
+                processed = run_pending(visibility_timeout=options['visibility_timeout'])
+                if processed:
+                    self.stdout.write(f'Processed {processed} job(s).')
+                if options['once']:
+                    break
+                time.sleep(options['poll_interval'])
+        except KeyboardInterrupt:
+            self.stdout.write('Job worker stopped.')
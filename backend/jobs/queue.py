@@ -0,0 +1,133 @@
+import logging
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Job
+
+
+logger = logging.getLogger(__name__)
+
+HANDLERS = {}
+FAILURE_HANDLERS = {}
+CLAIM_BATCH_SIZE = 10
+MAX_RETRY_DELAY_SECONDS = 300
+
+
+class LeaseLost(Exception):
+    pass
+
+
+def register(name, on_failure=None):
+    def decorator(func):
+        HANDLERS[name] = func
+        if on_failure is not None:
+            FAILURE_HANDLERS[name] = on_failure
+        return func
+
+    return decorator
+
+
+def enqueue(name, payload=None, max_attempts=None, delay=0):
+    return Job.objects.create(
+        name=name,
+        payload=payload or {},
+        max_attempts=max_attempts or settings.JOBS_MAX_ATTEMPTS,
+        available_at=timezone.now() + timedelta(seconds=delay),
+    )
+
+
+def _fail_exhausted(now):
+    expired = Job.objects.filter(status='RUNNING', locked_until__lt=now, attempts__gte=F('max_attempts'))
+    for job in expired[:CLAIM_BATCH_SIZE]:
+        failed = Job.objects.filter(id=job.id, status='RUNNING', locked_until=job.locked_until).update(
+            status='FAILED',
+            locked_until=None,
+            last_error='Lease expired on the final attempt.',
+        )
+        if failed:
+            logger.error('Job %s (%s) lease expired on its final attempt.', job.id, job.name)
+            _on_failure(job)
+
+
+def _on_failure(job):
+    on_failure = FAILURE_HANDLERS.get(job.name)
+    if on_failure is not None:
+        on_failure(**job.payload)
+
+
+def claim(visibility_timeout=None):
+    visibility_timeout = visibility_timeout or settings.JOBS_VISIBILITY_TIMEOUT
+    now = timezone.now()
+    _fail_exhausted(now)
+    candidates = (
+        Job.objects.filter(
+            Q(status='PENDING', available_at__lte=now)
+            | Q(status='RUNNING', locked_until__lt=now, attempts__lt=F('max_attempts'))
+        )
+        .order_by('available_at', 'id')
+        .values_list('id', 'status', 'locked_until')[:CLAIM_BATCH_SIZE]
+    )
+    for job_id, job_status, locked_until in candidates:
+        lock = Q(locked_until__isnull=True) if locked_until is None else Q(locked_until=locked_until)
+        claimed = Job.objects.filter(lock, id=job_id, status=job_status).update(
+            status='RUNNING',
+            locked_until=now + timedelta(seconds=visibility_timeout),
+            attempts=F('attempts') + 1,
+        )
+        if claimed:
+            return Job.objects.get(id=job_id)
+    return None
+
+
+def _retry_delay(attempts):
+    return min(2 ** attempts, MAX_RETRY_DELAY_SECONDS)
+
+
+def _held(job):
+    return Job.objects.filter(id=job.id, status='RUNNING', locked_until=job.locked_until)
+
+
+def run(job):
+    handler = HANDLERS.get(job.name)
+    try:
+        if handler is None:
+            raise LookupError(f'No handler registered for job {job.name!r}.')
+        with transaction.atomic():
+            handler(**job.payload)
+            if not _held(job).update(status='DONE', locked_until=None, last_error=''):
+                raise LeaseLost(job.id)
+    except LeaseLost:
+        logger.warning('Job %s (%s) lost its lease; its result was rolled back.', job.id, job.name)
+        return False
+    except Exception:
+        error = traceback.format_exc()
+        logger.exception('Job %s (%s) failed on attempt %s.', job.id, job.name, job.attempts)
+        if job.attempts >= job.max_attempts:
+            if _held(job).update(status='FAILED', locked_until=None, last_error=error):
+                _on_failure(job)
+        else:
+            _held(job).update(
+                status='PENDING',
+                locked_until=None,
+                available_at=timezone.now() + timedelta(seconds=_retry_delay(job.attempts)),
+                last_error=error,
+            )
+        return False
+
+    return True
+
+
+def run_pending(limit=None, visibility_timeout=None):
+    processed = 0
+    while limit is None or processed < limit:
+        job = claim(visibility_timeout=visibility_timeout)
+        if job is None:
+            break
+        run(job)
+        processed += 1
+    return processed
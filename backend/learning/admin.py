@@ -6,27 +6,28 @@ from .models import (
     AssessmentAnswer,
     FinalAssessmentAttempt,
     UserCourseProgress,
+    UserLearningState,
 )
 
 
 @admin.register(Course)
 class CourseAdmin(admin.ModelAdmin):
-    list_display = ('id', 'title', 'topic', 'difficulty')
-    list_filter = ('topic', 'difficulty')
+    list_display = ('id', 'title', 'topic', 'difficulty', 'assessment_mode')
+    list_filter = ('topic', 'difficulty', 'assessment_mode')
     search_fields = ('title', 'topic')
 
 
 @admin.register(Question)
 class QuestionAdmin(admin.ModelAdmin):
-    list_display = ('id', 'topic', 'difficulty', 'text')
+    list_display = ('id', 'topic', 'difficulty', 'irt_discrimination', 'irt_difficulty', 'text')
     list_filter = ('topic', 'difficulty')
     search_fields = ('text',)
 
 
 @admin.register(AssessmentAttempt)
 class AssessmentAttemptAdmin(admin.ModelAdmin):
-    list_display = ('id', 'user', 'selected_course', 'topic', 'current_difficulty', 'correct_count', 'overall_points', 'current_level')
-    list_filter = ('topic', 'current_difficulty', 'predicted_level')
+    list_display = ('id', 'user', 'selected_course', 'topic', 'assessment_mode', 'current_difficulty', 'correct_count', 'overall_points', 'current_level')
+    list_filter = ('topic', 'assessment_mode', 'current_difficulty', 'predicted_level')
 
 
 @admin.register(AssessmentAnswer)
@@ -43,3 +44,8 @@ class FinalAssessmentAttemptAdmin(admin.ModelAdmin):
 class UserCourseProgressAdmin(admin.ModelAdmin):
     list_display = ('id', 'user', 'course', 'status', 'score', 'completed_at')
     list_filter = ('status',)
+
+
+@admin.register(UserLearningState)
+class UserLearningStateAdmin(admin.ModelAdmin):
+    list_display = ('id', 'user', 'current_level', 'completed_count', 'pending_course', 'updated_at')
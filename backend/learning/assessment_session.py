@@ -0,0 +1,196 @@
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from .models import AssessmentAnswer, AssessmentAttempt, Question
+from . import irt
+from .question_pool import QuestionPool, pick_question
+from .utils import clamp_difficulty
+
+
+SESSION_CACHE_KEY = 'learning:assessment_session:{attempt_id}'
+
+
+class StaleSession(Exception):
+    pass
+
+
+class AssessmentSession:
+    def __init__(
+        self,
+        attempt_id,
+        user_id,
+        topic,
+        total_questions,
+        current_difficulty,
+        mode='LEVELS',
+        correct_count=0,
+        total_time=0.0,
+        answered_ids=None,
+        correctness=None,
+        finished=False,
+    ):
+        self.attempt_id = attempt_id
+        self.user_id = user_id
+        self.topic = topic
+        self.total_questions = total_questions
+        self.current_difficulty = current_difficulty
+        self.mode = mode
+        self.correct_count = correct_count
+        self.total_time = total_time
+        self.answered_ids = list(answered_ids or [])
+        self.correctness = list(correctness or [])
+        self.finished = finished
+
+    @classmethod
+    def cache_key(cls, attempt_id):
+        return SESSION_CACHE_KEY.format(attempt_id=attempt_id)
+
+    @classmethod
+    def from_attempt(cls, attempt, answers=()):
+        answered_ids = []
+        correctness = []
+        for question_id, is_correct in answers:
+            answered_ids.append(question_id)
+            correctness.append(is_correct)
+        return cls(
+            attempt_id=attempt.id,
+            user_id=attempt.user_id,
+            topic=attempt.topic,
+            total_questions=attempt.total_questions,
+            current_difficulty=attempt.current_difficulty,
+            mode=attempt.assessment_mode,
+            correct_count=attempt.correct_count,
+            total_time=attempt.total_time,
+            answered_ids=answered_ids,
+            correctness=correctness,
+            finished=attempt.finished_at is not None,
+        )
+
+    @classmethod
+    def load(cls, attempt_id, user_id):
+        data = cache.get(cls.cache_key(attempt_id))
+        if data is not None:
+            if data['user_id'] != user_id:
+                return None
+            return cls(**data)
+
+        attempt = AssessmentAttempt.objects.filter(id=attempt_id, user_id=user_id).first()
+        if not attempt:
+            return None
+        answers = attempt.answers.order_by('id').values_list('question_id', 'is_correct')
+        session = cls.from_attempt(attempt, answers)
+        session.save()
+        return session
+
+    def to_dict(self):
+        return {
+            'attempt_id': self.attempt_id,
+            'user_id': self.user_id,
+            'topic': self.topic,
+            'total_questions': self.total_questions,
+            'current_difficulty': self.current_difficulty,
+            'mode': self.mode,
+            'correct_count': self.correct_count,
+            'total_time': self.total_time,
+            'answered_ids': self.answered_ids,
+            'correctness': self.correctness,
+            'finished': self.finished,
+        }
+
+    def save(self):
+        cache.set(self.cache_key(self.attempt_id), self.to_dict(), settings.ASSESSMENT_SESSION_TTL)
+
+    def delete(self):
+        cache.delete(self.cache_key(self.attempt_id))
+
+    @property
+    def answered_count(self):
+        return len(self.answered_ids)
+
+    def has_answered(self, question_id):
+        return question_id in self.answered_ids
+
+    @property
+    def uses_irt(self):
+        return self.mode == 'IRT'
+
+    def estimate_ability(self, answered_ids=None, correctness=None):
+        answered_ids = self.answered_ids if answered_ids is None else answered_ids
+        correctness = self.correctness if correctness is None else correctness
+        a, b, found = QuestionPool.get_instance().item_parameters(self.topic, answered_ids)
+        responses = np.asarray(correctness, dtype=float)[found] if found.size else []
+        return irt.estimate_ability(a, b, responses)
+
+    def difficulty_after(self, question_id, is_correct):
+        if self.uses_irt:
+            ability, _ = self.estimate_ability(self.answered_ids + [question_id], self.correctness + [is_correct])
+            return irt.difficulty_for_ability(ability)
+        return clamp_difficulty(self.current_difficulty, is_correct)
+
+    def should_stop(self):
+        if self.answered_count >= self.total_questions:
+            return True
+        if not self.uses_irt or self.answered_count < settings.IRT_MIN_QUESTIONS:
+            return False
+        _, se = self.estimate_ability()
+        return se <= settings.IRT_SE_THRESHOLD
+
+    def _pick_next_id(self, answered_ids, correctness, difficulty):
+        pool = QuestionPool.get_instance()
+        if self.uses_irt:
+            ability, _ = self.estimate_ability(answered_ids, correctness)
+            question_id = pool.most_informative(self.topic, ability, exclude=answered_ids)
+            if question_id is not None:
+                return question_id
+        question_id = pool.pick(self.topic, difficulty, exclude=answered_ids)
+        if question_id is None:
+            question_id = pool.pick(self.topic, exclude=answered_ids)
+        return question_id
+
+    def next_question(self):
+        question_id = self._pick_next_id(self.answered_ids, self.correctness, self.current_difficulty)
+        if question_id is None:
+            return None
+        question = Question.objects.filter(id=question_id).first()
+        return question or pick_question(self.topic, exclude=self.answered_ids)
+
+    def record_answer(self, question, selected_option, is_correct, time_spent):
+        new_difficulty = self.difficulty_after(question.id, is_correct)
+        try:
+            with transaction.atomic():
+                updated = AssessmentAttempt.objects.filter(
+                    id=self.attempt_id,
+                    finished_at__isnull=True,
+                    answered_count=self.answered_count,
+                ).update(
+                    answered_count=F('answered_count') + 1,
+                    correct_count=F('correct_count') + (1 if is_correct else 0),
+                    total_time=F('total_time') + float(time_spent),
+                    current_difficulty=new_difficulty,
+                )
+                if not updated:
+                    if AssessmentAttempt.objects.filter(id=self.attempt_id, finished_at__isnull=True).exists():
+                        raise StaleSession(self.attempt_id)
+                    self.delete()
+                    return False
+                AssessmentAnswer.objects.create(
+                    attempt_id=self.attempt_id,
+                    question=question,
+                    selected_option=selected_option,
+                    is_correct=is_correct,
+                    time_spent=time_spent,
+                )
+        except (StaleSession, IntegrityError) as exc:
+            self.delete()
+            raise StaleSession(self.attempt_id) from exc
+
+        self.answered_ids.append(question.id)
+        self.correctness.append(is_correct)
+        self.correct_count += 1 if is_correct else 0
+        self.total_time += float(time_spent)
+        self.current_difficulty = new_difficulty
+        self.save()
+        return True
@@ -0,0 +1,120 @@
+import threading
+import uuid
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from accounts.constants import DEFAULT_INTERESTS
+from accounts.models import Interest
+from accounts.serializers import InterestSerializer
+from monitoring.metrics import record_cache
+from recommendations.models import FeedbackQuestion
+from recommendations.serializers import FeedbackQuestionSerializer
+
+from .models import Course
+from .serializers import CourseSerializer
+
+
+CATALOG_VERSION_KEY = 'catalog:version'
+CATALOG_PAYLOAD_KEY = 'catalog:{name}:{version}'
+CATALOG_PAYLOAD_TTL = 60 * 60 * 24
+
+_local = {}
+_local_lock = threading.Lock()
+
+
+def catalog_version():
+    version = cache.get(CATALOG_VERSION_KEY)
+    if version is None:
+        cache.add(CATALOG_VERSION_KEY, uuid.uuid4().hex, None)
+        version = cache.get(CATALOG_VERSION_KEY)
+    return version
+
+
+def bump_catalog_version():
+    version = uuid.uuid4().hex
+    cache.set(CATALOG_VERSION_KEY, version, None)
+    return version
+
+
+def _build_courses():
+    courses = Course.objects.all().order_by('topic', 'difficulty', 'title')
+    return [dict(item) for item in CourseSerializer(courses, many=True).data]
+
+
+def _build_courses_by_id():
+    return sorted(courses(), key=lambda item: item['id'])
+
+
+def _build_interests():
+    if not Interest.objects.exists():
+        Interest.objects.bulk_create(
+            [Interest(name=name) for name in DEFAULT_INTERESTS],
+            ignore_conflicts=True,
+        )
+    interests = Interest.objects.all().order_by('name')
+    return [dict(item) for item in InterestSerializer(interests, many=True).data]
+
+
+def _build_feedback_questions():
+    questions = FeedbackQuestion.objects.all().order_by('id')
+    return [dict(item) for item in FeedbackQuestionSerializer(questions, many=True).data]
+
+
+BUILDERS = {
+    'courses': _build_courses,
+    'courses_by_id': _build_courses_by_id,
+    'interests': _build_interests,
+    'feedback_questions': _build_feedback_questions,
+}
+
+
+def reference_data(name):
+    version = catalog_version()
+    local = _local.get(name)
+    if local is not None and local[0] == version:
+        record_cache('catalog', True)
+        return local[1]
+
+    key = CATALOG_PAYLOAD_KEY.format(name=name, version=version)
+    payload = cache.get(key)
+    record_cache('catalog', payload is not None)
+    if payload is None:
+        payload = BUILDERS[name]()
+        cache.set(key, payload, CATALOG_PAYLOAD_TTL)
+
+    with _local_lock:
+        _local[name] = (version, payload)
+    return payload
+
+
+def courses():
+    return reference_data('courses')
+
+
+def courses_by_id():
+    return reference_data('courses_by_id')
+
+
+def interests():
+    return reference_data('interests')
+
+
+def feedback_questions():
+    return reference_data('feedback_questions')
+
+
+def course_count():
+    return len(courses())
+
+
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+@receiver(post_save, sender=Interest)
+@receiver(post_delete, sender=Interest)
+@receiver(post_save, sender=FeedbackQuestion)
+@receiver(post_delete, sender=FeedbackQuestion)
+def invalidate_catalog(sender, **kwargs):
+    transaction.on_commit(bump_catalog_version)
@@ -0,0 +1,102 @@
+import random
+
+from django.conf import settings
+from django.core.cache import cache
+
+from monitoring.metrics import record_cache
+
+from .models import Question
+from .question_pool import VERSION_CACHE_KEY, QuestionPool
+from .serializers import QuestionPublicSerializer
+from .utils import DIFFICULTY_ORDER
+
+
+FORMS_CACHE_KEY = 'learning:final_forms:{course_id}'
+ROTATION_CACHE_KEY = 'learning:final_forms:rotation:{user_id}:{course_id}'
+ROTATION_TTL = 60 * 60 * 24 * 30
+
+
+def _fill_order(difficulty):
+    idx = DIFFICULTY_ORDER.index(difficulty) if difficulty in DIFFICULTY_ORDER else 0
+    others = [item for item in DIFFICULTY_ORDER if item != difficulty]
+    return sorted(others, key=lambda item: abs(DIFFICULTY_ORDER.index(item) - idx))
+
+
+def _deal(ids, form_index, count):
+    if not ids or count <= 0:
+        return []
+    start = form_index * count
+    return [ids[(start + offset) % len(ids)] for offset in range(min(count, len(ids)))]
+
+
+def assemble_forms(course, form_count=None):
+    pool = QuestionPool.get_instance()
+    form_count = form_count or settings.FINAL_FORMS_PER_COURSE
+    size = settings.FINAL_ASSESSMENT_QUESTIONS
+
+    primary = list(pool.ids(course.topic, course.difficulty))
+    random.shuffle(primary)
+    primary_count = min(size, len(primary))
+
+    fill_buckets = []
+    for difficulty in _fill_order(course.difficulty):
+        bucket = list(pool.ids(course.topic, difficulty))
+        random.shuffle(bucket)
+        if bucket:
+            fill_buckets.append(bucket)
+
+    fill_quota = [0] * len(fill_buckets)
+    remaining = size - primary_count
+    while remaining > 0 and any(quota < len(bucket) for quota, bucket in zip(fill_quota, fill_buckets)):
+        for idx, bucket in enumerate(fill_buckets):
+            if remaining and fill_quota[idx] < len(bucket):
+                fill_quota[idx] += 1
+                remaining -= 1
+
+    forms = []
+    for form_index in range(form_count):
+        form = _deal(primary, form_index, primary_count)
+        for quota, bucket in zip(fill_quota, fill_buckets):
+            form.extend(_deal(bucket, form_index, quota))
+        random.shuffle(form)
+        if form:
+            forms.append(form)
+
+    question_map = Question.objects.in_bulk({question_id for form in forms for question_id in form})
+    return [
+        QuestionPublicSerializer([question_map[question_id] for question_id in form if question_id in question_map], many=True).data
+        for form in forms
+    ]
+
+
+def refresh_forms(course):
+    pool = QuestionPool.get_instance()
+    pool.ids(course.topic)
+    forms = assemble_forms(course)
+    cache.set(FORMS_CACHE_KEY.format(course_id=course.id), {'version': pool.version, 'forms': forms}, None)
+    return forms
+
+
+def _next_rotation(user_id, course_id):
+    key = ROTATION_CACHE_KEY.format(user_id=user_id, course_id=course_id)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        start = random.randrange(settings.FINAL_FORMS_PER_COURSE)
+        cache.add(key, start, ROTATION_TTL)
+        return start
+
+
+def final_form_for(course, user_id):
+    forms_key = FORMS_CACHE_KEY.format(course_id=course.id)
+    cached = cache.get_many([forms_key, VERSION_CACHE_KEY])
+    entry = cached.get(forms_key)
+    if entry is None or entry['version'] != cached.get(VERSION_CACHE_KEY):
+        record_cache('final_forms', False)
+        forms = refresh_forms(course)
+    else:
+        record_cache('final_forms', True)
+        forms = entry['forms']
+    if not forms:
+        return []
+    return forms[_next_rotation(user_id, course.id) % len(forms)]
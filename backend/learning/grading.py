@@ -0,0 +1,49 @@
+import numpy as np
+
+
+OPTION_CODES = {'a': 0, 'b': 1, 'c': 2, 'd': 3}
+OPTION_BITS = 3
+OPTION_MASK = (1 << OPTION_BITS) - 1
+NO_CORRECT_OPTION = len(OPTION_CODES)
+MISSING = -1
+
+
+def option_code(option):
+    return OPTION_CODES.get((option or '').lower().strip(), MISSING)
+
+
+def pack(topic_code, correct_option):
+    return (topic_code << OPTION_BITS) | OPTION_CODES.get((correct_option or '').lower().strip(), NO_CORRECT_OPTION)
+
+
+def unpack(packed):
+    packed = np.asarray(packed)
+    return packed >> OPTION_BITS, packed & OPTION_MASK
+
+
+class AnswerKey:
+    def __init__(self, question_ids=(), packed=(), topic_codes=None):
+        order = np.argsort(np.asarray(question_ids, dtype=np.int64), kind='stable')
+        self.question_ids = np.asarray(question_ids, dtype=np.int64)[order]
+        self.packed = np.asarray(packed, dtype=np.int32)[order]
+        self.topic_codes = topic_codes or {}
+
+    def topic_code(self, topic):
+        return self.topic_codes.get((topic or '').lower(), MISSING)
+
+    def lookup(self, question_ids):
+        question_ids = np.asarray(question_ids, dtype=np.int64)
+        if not self.question_ids.size:
+            return np.zeros(question_ids.shape, dtype=bool), np.full(question_ids.shape, MISSING, dtype=np.int32)
+        positions = np.clip(np.searchsorted(self.question_ids, question_ids), 0, self.question_ids.size - 1)
+        found = self.question_ids[positions] == question_ids
+        packed = np.where(found, self.packed[positions], MISSING)
+        return found, packed
+
+    def grade(self, topic, question_ids, selected_options):
+        found, packed = self.lookup(question_ids)
+        topics, correct = unpack(packed)
+        valid = bool(found.all() and (topics == self.topic_code(topic)).all())
+        selected = np.asarray([option_code(option) for option in selected_options], dtype=np.int32)
+        correct_count = int(((selected == correct) & found).sum())
+        return valid, correct_count
@@ -0,0 +1,57 @@
+import numpy as np
+
+
+ABILITY_GRID = np.linspace(-4.0, 4.0, 81)
+ABILITY_PRIOR = np.exp(-0.5 * ABILITY_GRID ** 2)
+DIFFICULTY_BY_LEVEL = {
+    'easy': -1.0,
+    'medium': 0.0,
+    'hard': 1.0,
+}
+PROBABILITY_EPSILON = 1e-9
+
+
+def probability(theta, a, b):
+    return 1.0 / (1.0 + np.exp(-a * (theta - b)))
+
+
+def item_information(theta, a, b):
+    p = probability(theta, a, b)
+    return a ** 2 * p * (1.0 - p)
+
+
+def estimate_ability(a, b, responses):
+    a = np.asarray(a, dtype=float)
+    b = np.asarray(b, dtype=float)
+    responses = np.asarray(responses, dtype=float)
+
+    posterior = ABILITY_PRIOR.copy()
+    if responses.size:
+        p = np.clip(probability(ABILITY_GRID[:, None], a[None, :], b[None, :]), PROBABILITY_EPSILON, 1 - PROBABILITY_EPSILON)
+        log_likelihood = (responses * np.log(p) + (1.0 - responses) * np.log(1.0 - p)).sum(axis=1)
+        posterior = posterior * np.exp(log_likelihood - log_likelihood.max())
+    posterior /= posterior.sum()
+
+    theta = float((ABILITY_GRID * posterior).sum())
+    se = float(np.sqrt(((ABILITY_GRID - theta) ** 2 * posterior).sum()))
+    return theta, se
+
+
+def select_item(theta, a, b, available, randomesque=1, rng=None):
+    candidates = np.flatnonzero(available)
+    if not candidates.size:
+        return None
+
+    information = item_information(theta, a[candidates], b[candidates])
+    top = min(max(int(randomesque), 1), candidates.size)
+    best = np.argpartition(-information, top - 1)[:top]
+    rng = rng or np.random.default_rng()
+    return int(candidates[best[rng.integers(top)]])
+
+
+def difficulty_for_ability(theta):
+    if theta < -0.5:
+        return 'easy'
+    if theta < 0.5:
+        return 'medium'
+    return 'hard'
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from learning.final_forms import refresh_forms
+from learning.models import Course
+
+
+class Command(BaseCommand):
+    help = 'Pre-assemble cached final assessment forms for every course.'
+
+    def handle(self, *args, **options):
+        built = 0
+        for course in Course.objects.all().order_by('id'):
+            forms = refresh_forms(course)
+            built += len(forms)
+            self.stdout.write(f'{course.title}: {len(forms)} form(s)')
+
+        self.stdout.write(self.style.SUCCESS(f'Final forms built. Total: {built}'))
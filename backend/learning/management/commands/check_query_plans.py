@@ -0,0 +1,97 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Q
+from django.utils import timezone
+
+from jobs.models import Job
+from learning.models import (
+    AssessmentAnswer,
+    AssessmentAttempt,
+    FinalAssessmentAttempt,
+    Question,
+    UserCourseProgress,
+    UserLearningState,
+)
+from recommendations.models import FeedbackResponse, RecommendationLog
+from roadmaps.models import AIRoadmap
+
+
+def access_paths():
+    now = timezone.now()
+    return [
+        ('question pool bucket', Question.objects.filter(topic='Python', difficulty='easy')),
+        (
+            'assessment attempts by user and course',
+            AssessmentAttempt.objects.filter(user_id=1, selected_course_id=1, finished_at__isnull=False).order_by('-finished_at'),
+        ),
+        ('latest assessment attempt by user', AssessmentAttempt.objects.filter(user_id=1).order_by('-id')),
+        ('assessment answers by attempt', AssessmentAnswer.objects.filter(attempt_id=1).order_by('id')),
+        (
+            'latest failed final attempt by user',
+            FinalAssessmentAttempt.objects.filter(user_id=1, passed=False).exclude(course_id__in=[1, 2]).order_by('-created_at'),
+        ),
+        (
+            'latest final attempt by user and course',
+            FinalAssessmentAttempt.objects.filter(user_id=1, course_id=1).order_by('-created_at'),
+        ),
+        (
+            'latest final attempt by user, course and result',
+            FinalAssessmentAttempt.objects.filter(user_id=1, course_id=1, passed=False).order_by('-created_at'),
+        ),
+        (
+            'completed courses by user',
+            UserCourseProgress.objects.filter(user_id=1, status='COMPLETED').select_related('course').order_by('-completed_at'),
+        ),
+        (
+            'in-progress courses by user',
+            UserCourseProgress.objects.filter(user_id=1, status='IN_PROGRESS').exclude(course_id__in=[1, 2]).order_by('-id'),
+        ),
+        ('course progress by user and course', UserCourseProgress.objects.filter(user_id=1, course_id=1)),
+        ('learning state by user', UserLearningState.objects.select_related('pending_course').filter(user_id=1)),
+        (
+            'cached roadmap by signature',
+            AIRoadmap.objects.filter(user_id=1, course_id=1, prompt_signature='0' * 64).order_by('-created_at'),
+        ),
+        ('latest roadmap by user and course', AIRoadmap.objects.filter(user_id=1, course_id=1).order_by('-created_at')),
+        ('latest recommendation log by attempt', RecommendationLog.objects.filter(attempt_id=1).order_by('-created_at')),
+        ('feedback by user and final attempt', FeedbackResponse.objects.filter(user_id=1, final_attempt_id=1)),
+        (
+            'feedback by user, final attempt and type',
+            FeedbackResponse.objects.filter(user_id=1, final_attempt_id=1, feedback_type='FAIL_DIFFICULTY'),
+        ),
+        (
+            'claimable jobs',
+            Job.objects.filter(Q(status='PENDING', available_at__lte=now) | Q(status='RUNNING', locked_until__lt=now)).order_by('available_at', 'id'),
+        ),
+    ]
+
+
+def full_scans(plan):
+    return [line.strip() for line in plan.splitlines() if ' SCAN ' in f' {line.strip()} ' and 'CONSTANT ROW' not in line]
+
+
+class Command(BaseCommand):
+    help = 'EXPLAIN the hot query patterns against SQLite and fail if any of them falls back to a full scan.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--verbose-plans', action='store_true', help='Print every query plan.')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('check_query_plans runs against SQLite. Set DB_ENGINE=sqlite.')
+
+        failures = []
+        for label, queryset in access_paths():
+            plan = queryset.explain()
+            scans = full_scans(plan)
+            if options['verbose_plans'] or scans:
+                self.stdout.write(f'{label}:\n{plan}\n')
+            if scans:
+                failures.append((label, scans))
+
+        if failures:
+            for label, scans in failures:
+                self.stdout.write(self.style.ERROR(f'Full scan in "{label}": {"; ".join(scans)}'))
+            raise CommandError(f'{len(failures)} query pattern(s) fall back to a full scan.')
+
+        self.stdout.write(self.style.SUCCESS(f'Query plans OK. Checked: {len(access_paths())}'))
@@ -0,0 +1,22 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from learning.state import rebuild_learning_state
+
+
+class Command(BaseCommand):
+    help = 'Recompute every user learning state row from the source tables.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user-id', type=int, action='append', dest='user_ids')
+
+    def handle(self, *args, **options):
+        users = get_user_model().objects.select_related('profile').order_by('id')
+        if options['user_ids']:
+            users = users.filter(id__in=options['user_ids'])
+
+        rebuilt = 0
+        for user in users.iterator():
+            rebuild_learning_state(user)
+            rebuilt += 1
+
+        self.stdout.write(self.style.SUCCESS(f'Learning state rebuilt for {rebuilt} user(s).'))
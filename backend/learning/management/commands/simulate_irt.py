@@ -0,0 +1,64 @@
+import numpy as np
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from learning import irt
+from learning.models import Question
+from learning.question_pool import QuestionPool
+
+
+class Command(BaseCommand):
+    help = 'Simulate IRT attempts against the question pool and report how often the standard-error rule stops them early.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--topic', action='append', help='Topic to simulate (repeatable). Defaults to every topic.')
+        parser.add_argument('--learners', type=int, default=500)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        pool = QuestionPool.get_instance()
+        topics = options['topic'] or sorted(set(Question.objects.values_list('topic', flat=True)))
+        max_questions = settings.ASSESSMENT_TOTAL_QUESTIONS
+        rng = np.random.default_rng(options['seed'])
+        stopped_early = 0
+        simulated = 0
+
+        for topic in topics:
+            ids = pool.ids(topic)
+            a, b, _ = pool.item_parameters(topic, ids)
+            if not a.size:
+                self.stdout.write(f'{topic}: no questions')
+                continue
+            lengths = []
+            errors = []
+            for ability in rng.normal(size=options['learners']):
+                available = np.ones(a.size, dtype=bool)
+                asked = []
+                responses = []
+                estimate, se = irt.estimate_ability(a[asked], b[asked], responses)
+                while len(asked) < min(max_questions, a.size):
+                    idx = irt.select_item(estimate, a, b, available, randomesque=settings.IRT_RANDOMESQUE, rng=rng)
+                    available[idx] = False
+                    asked.append(idx)
+                    responses.append(float(rng.random() < irt.probability(ability, a[idx], b[idx])))
+                    estimate, se = irt.estimate_ability(a[asked], b[asked], responses)
+                    if len(asked) >= settings.IRT_MIN_QUESTIONS and se <= settings.IRT_SE_THRESHOLD:
+                        break
+                lengths.append(len(asked))
+                errors.append(estimate - ability)
+            lengths = np.asarray(lengths)
+            early = int((lengths < max_questions).sum())
+            stopped_early += early
+            simulated += lengths.size
+            self.stdout.write(
+                f'{topic}: mean questions {lengths.mean():.2f} of {max_questions}, '
+                f'stopped early {early / lengths.size:.1%}, ability RMSE {np.sqrt(np.mean(np.square(errors))):.2f}'
+            )
+
+        if not simulated:
+            raise CommandError('No questions to simulate. Run seed_questions first.')
+        if not stopped_early:
+            raise CommandError(
+                f'No simulated attempt reached IRT_SE_THRESHOLD={settings.IRT_SE_THRESHOLD} before {max_questions} questions.'
+            )
+        self.stdout.write(self.style.SUCCESS(f'Early stops: {stopped_early} of {simulated} simulated attempts.'))
@@ -0,0 +1,33 @@
+# Generated by Django 5.1.4 on 2026-10-18 01:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning', '0002_assessmentattempt_current_level_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='assessmentattempt',
+            name='assessment_mode',
+            field=models.CharField(choices=[('LEVELS', 'LEVELS'), ('IRT', 'IRT')], default='LEVELS', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='assessment_mode',
+            field=models.CharField(choices=[('LEVELS', 'LEVELS'), ('IRT', 'IRT')], default='LEVELS', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='question',
+            name='irt_difficulty',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='question',
+            name='irt_discrimination',
+            field=models.FloatField(default=1.0),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.1.4 on 2026-10-18 01:47
+
+from django.db import migrations, models
+
+
+def mark_finished_attempts_completed(apps, schema_editor):
+    AssessmentAttempt = apps.get_model('learning', 'AssessmentAttempt')
+    AssessmentAttempt.objects.filter(finished_at__isnull=False).update(status='COMPLETED')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning', '0003_assessmentattempt_assessment_mode_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='assessmentattempt',
+            name='status',
+            field=models.CharField(choices=[('IN_PROGRESS', 'IN_PROGRESS'), ('FINALIZING', 'FINALIZING'), ('COMPLETED', 'COMPLETED'), ('FAILED', 'FAILED')], default='IN_PROGRESS', max_length=20),
+        ),
+        migrations.RunPython(mark_finished_attempts_completed, migrations.RunPython.noop),
+    ]
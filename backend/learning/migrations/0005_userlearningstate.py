@@ -0,0 +1,97 @@
+# Generated by Django 5.1.4 on 2026-10-18 01:50
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from rest_framework import serializers
+
+
+def backfill_learning_state(apps, schema_editor):
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split('.'))
+    UserProfile = apps.get_model('accounts', 'UserProfile')
+    UserLearningState = apps.get_model('learning', 'UserLearningState')
+    UserCourseProgress = apps.get_model('learning', 'UserCourseProgress')
+    FinalAssessmentAttempt = apps.get_model('learning', 'FinalAssessmentAttempt')
+    AssessmentAttempt = apps.get_model('learning', 'AssessmentAttempt')
+    datetime_field = serializers.DateTimeField()
+    levels = dict(UserProfile.objects.values_list('user_id', 'current_level'))
+
+    for user_id in User.objects.order_by('id').values_list('id', flat=True).iterator(chunk_size=2000):
+        completed = [
+            {
+                'id': item.course.id,
+                'title': item.course.title,
+                'topic': item.course.topic,
+                'difficulty': item.course.difficulty,
+                'score': item.score,
+                'completed_at': datetime_field.to_representation(item.completed_at) if item.completed_at else None,
+            }
+            for item in UserCourseProgress.objects.filter(user_id=user_id, status='COMPLETED')
+            .select_related('course')
+            .order_by('-completed_at')
+        ]
+        completed_ids = [item['id'] for item in completed]
+        pending_course_id = pending_attempt_id = None
+        latest_failed = (
+            FinalAssessmentAttempt.objects.filter(user_id=user_id, passed=False)
+            .exclude(course_id__in=completed_ids)
+            .order_by('-created_at')
+            .first()
+        )
+        if latest_failed:
+            pending_course_id, pending_attempt_id = latest_failed.course_id, latest_failed.id
+        else:
+            in_progress = (
+                UserCourseProgress.objects.filter(user_id=user_id, status='IN_PROGRESS')
+                .exclude(course_id__in=completed_ids)
+                .order_by('-id')
+                .first()
+            )
+            if in_progress:
+                pending_course_id = in_progress.course_id
+                pending_attempt_id = (
+                    FinalAssessmentAttempt.objects.filter(user_id=user_id, course_id=in_progress.course_id)
+                    .order_by('-created_at')
+                    .values_list('id', flat=True)
+                    .first()
+                )
+        UserLearningState.objects.get_or_create(
+            user_id=user_id,
+            defaults={
+                'current_level': levels.get(user_id, 'Beginner'),
+                'completed_courses': completed,
+                'completed_count': len(completed),
+                'pending_course_id': pending_course_id,
+                'pending_last_attempt_id': pending_attempt_id,
+                'last_assessment_attempt_id': (
+                    AssessmentAttempt.objects.filter(user_id=user_id).order_by('-id').values_list('id', flat=True).first()
+                ),
+            },
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning', '0004_assessmentattempt_status'),
+        ('accounts', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserLearningState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('current_level', models.CharField(default='Beginner', max_length=20)),
+                ('completed_count', models.PositiveIntegerField(default=0)),
+                ('completed_courses', models.JSONField(default=list)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('last_assessment_attempt', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='learning.assessmentattempt')),
+                ('pending_course', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='learning.course')),
+                ('pending_last_attempt', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='learning.finalassessmentattempt')),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='learning_state', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.RunPython(backfill_learning_state, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.1.4 on 2026-10-18 01:52
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning', '0005_userlearningstate'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='assessmentattempt',
+            index=models.Index(fields=['user', 'selected_course', 'finished_at'], name='attempt_user_course_fin_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='finalassessmentattempt',
+            index=models.Index(fields=['user', 'course', 'passed', 'created_at'], name='final_user_course_pass_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='finalassessmentattempt',
+            index=models.Index(fields=['user', 'passed', 'created_at'], name='final_user_pass_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='finalassessmentattempt',
+            index=models.Index(fields=['user', 'course', 'created_at'], name='final_user_course_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='question',
+            index=models.Index(fields=['topic', 'difficulty'], name='question_topic_diff_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='usercourseprogress',
+            index=models.Index(fields=['user', 'status'], name='progress_user_status_idx'),
+        ),
+    ]
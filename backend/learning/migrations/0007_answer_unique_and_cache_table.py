@@ -0,0 +1,36 @@
+from django.core.management import call_command
+from django.db import migrations, models
+
+
+def create_cache_table(apps, schema_editor):
+    call_command('createcachetable', database=schema_editor.connection.alias, verbosity=0)
+
+
+def drop_duplicate_answers(apps, schema_editor):
+    AssessmentAnswer = apps.get_model('learning', 'AssessmentAnswer')
+    seen = set()
+    duplicates = []
+    rows = AssessmentAnswer.objects.order_by('attempt_id', 'id').values_list('id', 'attempt_id', 'question_id')
+    for answer_id, attempt_id, question_id in rows.iterator(chunk_size=5000):
+        if (attempt_id, question_id) in seen:
+            duplicates.append(answer_id)
+        else:
+            seen.add((attempt_id, question_id))
+    for start in range(0, len(duplicates), 500):
+        AssessmentAnswer.objects.filter(id__in=duplicates[start:start + 500]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning', '0006_assessmentattempt_attempt_user_course_fin_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_cache_table, migrations.RunPython.noop),
+        migrations.RunPython(drop_duplicate_answers, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='assessmentanswer',
+            constraint=models.UniqueConstraint(fields=('attempt', 'question'), name='answer_attempt_question_uniq'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_answered_count(apps, schema_editor):
+    AssessmentAttempt = apps.get_model('learning', 'AssessmentAttempt')
+    counts = AssessmentAttempt.objects.annotate(answers_total=Count('answers')).filter(answers_total__gt=0)
+    for attempt_id, answers_total in counts.values_list('id', 'answers_total').iterator(chunk_size=5000):
+        AssessmentAttempt.objects.filter(id=attempt_id).update(answered_count=answers_total)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning', '0007_answer_unique_and_cache_table'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='assessmentattempt',
+            name='answered_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_answered_count, migrations.RunPython.noop),
+    ]
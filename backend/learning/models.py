@@ -8,12 +8,17 @@ class Course(models.Model):
         ('medium', 'medium'),
         ('hard', 'hard'),
     )
+    ASSESSMENT_MODE_CHOICES = (
+        ('LEVELS', 'LEVELS'),
+        ('IRT', 'IRT'),
+    )
 
     title = models.CharField(max_length=255)
     topic = models.CharField(max_length=100)
     difficulty = models.CharField(max_length=10, choices=DIFFICULTY_CHOICES)
     description = models.TextField()
     url = models.URLField(max_length=500)
+    assessment_mode = models.CharField(max_length=10, choices=ASSESSMENT_MODE_CHOICES, default='LEVELS')
 
     def __str__(self):
         return self.title
@@ -30,25 +35,47 @@ class Question(models.Model):
     option_c = models.CharField(max_length=255)
     option_d = models.CharField(max_length=255)
     correct_option = models.CharField(max_length=1)
+    irt_discrimination = models.FloatField(default=1.0)
+    irt_difficulty = models.FloatField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['topic', 'difficulty'], name='question_topic_diff_idx'),
+        ]
 
     def __str__(self):
         return f"{self.topic} [{self.difficulty}]"
 
 
 class AssessmentAttempt(models.Model):
+    STATUS_CHOICES = (
+        ('IN_PROGRESS', 'IN_PROGRESS'),
+        ('FINALIZING', 'FINALIZING'),
+        ('COMPLETED', 'COMPLETED'),
+        ('FAILED', 'FAILED'),
+    )
+
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='assessment_attempts')
     selected_course = models.ForeignKey('Course', on_delete=models.SET_NULL, null=True, blank=True, related_name='assessment_attempts')
     topic = models.CharField(max_length=100)
     started_at = models.DateTimeField(auto_now_add=True)
     finished_at = models.DateTimeField(null=True, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='IN_PROGRESS')
     current_difficulty = models.CharField(max_length=10, choices=Course.DIFFICULTY_CHOICES, default='easy')
+    assessment_mode = models.CharField(max_length=10, choices=Course.ASSESSMENT_MODE_CHOICES, default='LEVELS')
     total_questions = models.PositiveIntegerField(default=10)
+    answered_count = models.PositiveIntegerField(default=0)
     correct_count = models.PositiveIntegerField(default=0)
     total_time = models.FloatField(default=0)
     overall_points = models.FloatField(default=0)
     predicted_level = models.CharField(max_length=20, default='Beginner')
     current_level = models.CharField(max_length=20, default='Beginner')
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'selected_course', 'finished_at'], name='attempt_user_course_fin_idx'),
+        ]
+
     def __str__(self):
         return f"Attempt {self.id} - {self.user.email}"
 
@@ -60,6 +87,11 @@ class AssessmentAnswer(models.Model):
     is_correct = models.BooleanField(default=False)
     time_spent = models.FloatField(default=0)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['attempt', 'question'], name='answer_attempt_question_uniq'),
+        ]
+
     def __str__(self):
         return f"Answer {self.id} - Attempt {self.attempt_id}"
 
@@ -72,6 +104,13 @@ class FinalAssessmentAttempt(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     attempts_count = models.PositiveIntegerField(default=1)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'course', 'passed', 'created_at'], name='final_user_course_pass_idx'),
+            models.Index(fields=['user', 'passed', 'created_at'], name='final_user_pass_created_idx'),
+            models.Index(fields=['user', 'course', 'created_at'], name='final_user_course_created_idx'),
+        ]
+
     def __str__(self):
         return f"Final {self.id} - {self.user.email} - {self.course.title}"
 
@@ -90,6 +129,27 @@ class UserCourseProgress(models.Model):
 
     class Meta:
         unique_together = ('user', 'course')
+        indexes = [
+            models.Index(fields=['user', 'status'], name='progress_user_status_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.email} - {self.course.title} ({self.status})"
+
+
+class UserLearningState(models.Model):
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='learning_state')
+    current_level = models.CharField(max_length=20, default='Beginner')
+    completed_count = models.PositiveIntegerField(default=0)
+    completed_courses = models.JSONField(default=list)
+    pending_course = models.ForeignKey(Course, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    pending_last_attempt = models.ForeignKey(
+        FinalAssessmentAttempt, on_delete=models.SET_NULL, null=True, blank=True, related_name='+'
+    )
+    last_assessment_attempt = models.ForeignKey(
+        AssessmentAttempt, on_delete=models.SET_NULL, null=True, blank=True, related_name='+'
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Learning state - {self.user.email}"
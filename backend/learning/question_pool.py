@@ -0,0 +1,204 @@
+import random
+import threading
+import time
+import uuid
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from monitoring.metrics import record_cache
+
+from . import irt
+from .grading import AnswerKey, pack
+from .models import Question
+
+
+VERSION_CACHE_KEY = 'learning:question_pool:version'
+MAX_REJECTIONS = 16
+
+
+class QuestionPool:
+    _instance = None
+    _lock = threading.Lock()
+
+    def __init__(self):
+        self.version = None
+        self.checked_at = 0.0
+        self.by_bucket = {}
+        self.by_topic = {}
+        self.irt_by_topic = {}
+        self.answer_key = AnswerKey()
+
+    @classmethod
+    def get_instance(cls):
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = QuestionPool()
+        return cls._instance
+
+    def _current_version(self):
+        version = cache.get(VERSION_CACHE_KEY)
+        if version is None:
+            cache.add(VERSION_CACHE_KEY, uuid.uuid4().hex, None)
+            version = cache.get(VERSION_CACHE_KEY)
+        return version
+
+    def expire(self):
+        self.version = None
+        self.checked_at = 0.0
+
+    def _ensure_fresh(self):
+        now = time.monotonic()
+        if self.version is not None and now - self.checked_at < settings.QUESTION_POOL_CHECK_INTERVAL:
+            record_cache('question_pool', True)
+            return
+        version = self._current_version()
+        if version is not None and version == self.version:
+            self.checked_at = now
+            record_cache('question_pool', True)
+            return
+        with self._lock:
+            if version is not None and version == self.version:
+                record_cache('question_pool', True)
+                return
+            record_cache('question_pool', False)
+            by_bucket = {}
+            by_topic = {}
+            params_by_topic = {}
+            topic_codes = {}
+            key_ids = []
+            key_packed = []
+            rows = Question.objects.values_list(
+                'id', 'topic', 'difficulty', 'correct_option', 'irt_discrimination', 'irt_difficulty'
+            ).order_by('id')
+            for question_id, topic, difficulty, correct_option, discrimination, irt_difficulty in rows:
+                topic_key = topic.lower()
+                topic_code = topic_codes.setdefault(topic_key, len(topic_codes))
+                key_ids.append(question_id)
+                key_packed.append(pack(topic_code, correct_option))
+                by_bucket.setdefault((topic_key, difficulty), []).append(question_id)
+                by_topic.setdefault(topic_key, []).append(question_id)
+                if irt_difficulty is None:
+                    irt_difficulty = irt.DIFFICULTY_BY_LEVEL.get(difficulty, 0.0)
+                params_by_topic.setdefault(topic_key, []).append((discrimination, irt_difficulty))
+
+            irt_by_topic = {}
+            for topic_key, params in params_by_topic.items():
+                ids = by_topic[topic_key]
+                irt_by_topic[topic_key] = {
+                    'ids': np.asarray(ids, dtype=np.int64),
+                    'a': np.asarray([item[0] for item in params], dtype=float),
+                    'b': np.asarray([item[1] for item in params], dtype=float),
+                    'position': {question_id: idx for idx, question_id in enumerate(ids)},
+                }
+
+            self.by_bucket = by_bucket
+            self.by_topic = by_topic
+            self.irt_by_topic = irt_by_topic
+            self.answer_key = AnswerKey(key_ids, key_packed, topic_codes)
+            self.version = version
+            self.checked_at = now
+
+    def _ids(self, topic, difficulty=None):
+        topic_key = (topic or '').lower()
+        if difficulty is None:
+            return self.by_topic.get(topic_key, [])
+        return self.by_bucket.get((topic_key, difficulty), [])
+
+    def ids(self, topic, difficulty=None):
+        self._ensure_fresh()
+        return self._ids(topic, difficulty)
+
+    def get_answer_key(self):
+        self._ensure_fresh()
+        return self.answer_key
+
+    def _irt_params(self, topic):
+        return self.irt_by_topic.get((topic or '').lower())
+
+    def item_parameters(self, topic, question_ids):
+        self._ensure_fresh()
+        params = self._irt_params(topic)
+        position = params['position'] if params else {}
+        found = np.asarray([question_id in position for question_id in question_ids], dtype=bool)
+        if not found.any():
+            return np.empty(0), np.empty(0), found
+        positions = [position[question_id] for question_id in question_ids if question_id in position]
+        return params['a'][positions], params['b'][positions], found
+
+    def most_informative(self, topic, ability, exclude=()):
+        self._ensure_fresh()
+        params = self._irt_params(topic)
+        if params is None:
+            return None
+        available = np.ones(params['ids'].size, dtype=bool)
+        for question_id in exclude:
+            position = params['position'].get(question_id)
+            if position is not None:
+                available[position] = False
+        idx = irt.select_item(ability, params['a'], params['b'], available, randomesque=settings.IRT_RANDOMESQUE)
+        return None if idx is None else int(params['ids'][idx])
+
+    def sample(self, topic, difficulty=None, k=1, exclude=()):
+        self._ensure_fresh()
+        ids = self._ids(topic, difficulty)
+        if not ids or k <= 0:
+            return []
+
+        seen = set(exclude)
+        chosen = []
+        rejections = 0
+        while len(chosen) < k and rejections < MAX_REJECTIONS:
+            question_id = ids[random.randrange(len(ids))]
+            if question_id in seen:
+                rejections += 1
+                continue
+            seen.add(question_id)
+            chosen.append(question_id)
+
+        if len(chosen) < k:
+            remaining = [question_id for question_id in ids if question_id not in seen]
+            chosen.extend(random.sample(remaining, min(k - len(chosen), len(remaining))))
+        return chosen
+
+    def pick(self, topic, difficulty=None, exclude=()):
+        chosen = self.sample(topic, difficulty, k=1, exclude=exclude)
+        return chosen[0] if chosen else None
+
+
+def invalidate():
+    cache.set(VERSION_CACHE_KEY, uuid.uuid4().hex, None)
+    if QuestionPool._instance is not None:
+        QuestionPool._instance.expire()
+
+
+def pick_question(topic, difficulty=None, exclude=()):
+    pool = QuestionPool.get_instance()
+    excluded = set(exclude)
+    for _ in range(2):
+        question_id = pool.pick(topic, difficulty, exclude=excluded)
+        if question_id is None:
+            return None
+        question = Question.objects.filter(id=question_id).first()
+        if question:
+            return question
+        excluded.add(question_id)
+        pool.expire()
+    return None
+
+
+def pick_informative_question(topic, ability, exclude=()):
+    question_id = QuestionPool.get_instance().most_informative(topic, ability, exclude=exclude)
+    question = Question.objects.filter(id=question_id).first() if question_id is not None else None
+    return question or pick_question(topic, irt.difficulty_for_ability(ability), exclude=exclude)
+
+
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+def invalidate_question_pool(sender, **kwargs):
+    transaction.on_commit(invalidate)
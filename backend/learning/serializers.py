@@ -7,7 +7,7 @@ class CourseSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Course
-        fields = ('id', 'title', 'topic', 'difficulty', 'description', 'url', 'why_recommended')
+        fields = ('id', 'title', 'topic', 'difficulty', 'description', 'url', 'assessment_mode', 'why_recommended')
 
 
 class QuestionPublicSerializer(serializers.ModelSerializer):
@@ -0,0 +1,75 @@
+from django.conf import settings
+from django.utils import timezone
+
+from recommendations.models import RecommendationLog
+from recommendations.services import infer_level_and_recommend
+from roadmaps.services import get_or_generate_roadmap
+
+from .models import Course
+from .state import set_current_level
+from .utils import compute_overall_points
+
+
+def attach_roadmaps(user, courses, current_level, overall_points):
+    interests_list = list(user.profile.interests.values_list('name', flat=True))
+    with_roadmaps = []
+    for item in courses[:3]:
+        course = Course.objects.filter(id=item['id']).first()
+        if not course:
+            continue
+        roadmap = get_or_generate_roadmap(
+            user=user,
+            course=course,
+            current_level=current_level,
+            overall_points=overall_points,
+            interests_list=interests_list,
+        )
+        row = dict(item)
+        row['roadmap'] = roadmap
+        with_roadmaps.append(row)
+    return with_roadmaps
+
+
+def close_attempt(attempt, total_questions, correctness):
+    attempt.finished_at = timezone.now()
+    attempt.total_questions = total_questions
+    attempt.overall_points = compute_overall_points(
+        correct_count=attempt.correct_count,
+        total_questions=attempt.total_questions,
+        total_time=attempt.total_time,
+        correctness=correctness,
+        target_time=settings.TARGET_TIME_PER_QUESTION,
+    )
+
+
+def finalize_attempt(attempt, correctness=None):
+    if correctness is None:
+        correctness = list(attempt.answers.order_by('id').values_list('is_correct', flat=True))
+
+    current_level, courses = infer_level_and_recommend(
+        topic=attempt.topic,
+        correct_count=attempt.correct_count,
+        total_questions=attempt.total_questions,
+        total_time=attempt.total_time,
+        correctness=correctness,
+        top_k=3,
+    )
+    recommended_with_roadmaps = attach_roadmaps(
+        attempt.user,
+        courses,
+        current_level=current_level,
+        overall_points=attempt.overall_points,
+    )
+
+    attempt.predicted_level = current_level
+    attempt.current_level = current_level
+    attempt.status = 'COMPLETED'
+    attempt.save()
+
+    profile = attempt.user.profile
+    profile.current_level = current_level
+    profile.save()
+    set_current_level(attempt.user, current_level)
+
+    RecommendationLog.objects.create(attempt=attempt, courses_json=recommended_with_roadmaps)
+    return current_level, recommended_with_roadmaps
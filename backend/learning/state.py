@@ -0,0 +1,150 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from django.utils import timezone
+from rest_framework import serializers
+
+from .models import AssessmentAttempt, FinalAssessmentAttempt, UserCourseProgress, UserLearningState
+
+
+_datetime_field = serializers.DateTimeField()
+
+
+def _completed_entry(course, progress):
+    return {
+        'id': course.id,
+        'title': course.title,
+        'topic': course.topic,
+        'difficulty': course.difficulty,
+        'score': progress.score,
+        'completed_at': _datetime_field.to_representation(progress.completed_at) if progress.completed_at else None,
+    }
+
+
+def _completed_courses(user):
+    completed = (
+        UserCourseProgress.objects.filter(user=user, status='COMPLETED')
+        .select_related('course')
+        .order_by('-completed_at')
+    )
+    return [_completed_entry(item.course, item) for item in completed]
+
+
+def _pending_final(user, completed_course_ids):
+    latest_failed = (
+        FinalAssessmentAttempt.objects.filter(user=user, passed=False)
+        .exclude(course_id__in=completed_course_ids)
+        .order_by('-created_at')
+        .first()
+    )
+    if latest_failed:
+        return latest_failed.course_id, latest_failed.id
+
+    in_progress = (
+        UserCourseProgress.objects.filter(user=user, status='IN_PROGRESS')
+        .exclude(course_id__in=completed_course_ids)
+        .order_by('-id')
+        .first()
+    )
+    if in_progress:
+        last_attempt = (
+            FinalAssessmentAttempt.objects.filter(user=user, course_id=in_progress.course_id)
+            .order_by('-created_at')
+            .first()
+        )
+        return in_progress.course_id, last_attempt.id if last_attempt else None
+
+    return None, None
+
+
+def _fill_state(state, user):
+    completed = _completed_courses(user)
+    state.completed_courses = completed
+    state.completed_count = len(completed)
+    state.pending_course_id, state.pending_last_attempt_id = _pending_final(
+        user,
+        [item['id'] for item in completed],
+    )
+    state.last_assessment_attempt_id = (
+        AssessmentAttempt.objects.filter(user=user).order_by('-id').values_list('id', flat=True).first()
+    )
+    return state
+
+
+def rebuild_learning_state(user):
+    with transaction.atomic():
+        state, _ = UserLearningState.objects.select_for_update().get_or_create(
+            user=user,
+            defaults={'current_level': user.profile.current_level},
+        )
+        _fill_state(state, user).save()
+    return state
+
+
+def _apply(states, **changes):
+    return states.update(updated_at=timezone.now(), **changes)
+
+
+def set_current_level(user, current_level):
+    if not _apply(UserLearningState.objects.filter(user=user), current_level=current_level):
+        rebuild_learning_state(user)
+
+
+def record_assessment_started(user, attempt):
+    _apply(UserLearningState.objects.filter(user=user), last_assessment_attempt=attempt)
+
+
+def record_course_started(user, course):
+    # The newest in-progress course is pending unless a failed final already is.
+    _apply(
+        UserLearningState.objects.filter(user=user).exclude(pending_last_attempt__passed=False),
+        pending_course=course,
+        pending_last_attempt=None,
+    )
+
+
+def record_final_retry(user, course, attempt):
+    _apply(UserLearningState.objects.filter(user=user), pending_course=course, pending_last_attempt=attempt)
+
+
+def record_final_result(user, course, attempt, progress):
+    state = UserLearningState.objects.select_for_update().filter(user=user).first()
+    if state is None:
+        return
+    completed = [item for item in state.completed_courses if item['id'] != course.id]
+    if attempt.passed:
+        completed.insert(0, _completed_entry(course, progress))
+        if state.pending_course_id == course.id:
+            state.pending_course_id, state.pending_last_attempt_id = _pending_final(
+                user,
+                [item['id'] for item in completed],
+            )
+    else:
+        state.pending_course_id, state.pending_last_attempt_id = course.id, attempt.id
+    state.completed_courses = completed
+    state.completed_count = len(completed)
+    state.save()
+
+
+def get_learning_state(user):
+    state = UserLearningState.objects.select_related('pending_course').filter(user=user).first()
+    if state is None:
+        state = _fill_state(UserLearningState(user=user, current_level=user.profile.current_level), user)
+    return state
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def create_learning_state(sender, instance, created, **kwargs):
+    if created:
+        UserLearningState.objects.get_or_create(user=instance)
+
+
+def pending_final_payload(state):
+    if state.pending_course is None:
+        return None
+    return {
+        'course_id': state.pending_course.id,
+        'course_title': state.pending_course.title,
+        'last_attempt_id': state.pending_last_attempt_id,
+    }
@@ -0,0 +1,16 @@
+from jobs.queue import register
+
+from .models import AssessmentAttempt
+from .services import finalize_attempt
+
+
+def mark_finalization_failed(attempt_id):
+    AssessmentAttempt.objects.filter(id=attempt_id, status='FINALIZING').update(status='FAILED')
+
+
+@register('learning.finalize_attempt', on_failure=mark_finalization_failed)
+def finalize_attempt_job(attempt_id):
+    attempt = AssessmentAttempt.objects.select_for_update().filter(id=attempt_id, status='FINALIZING').first()
+    if attempt is None:
+        return
+    finalize_attempt(attempt)
@@ -0,0 +1,23 @@
+from io import StringIO
+from unittest import skipUnless
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+
+from learning.management.commands.check_query_plans import access_paths, full_scans
+
+
+@skipUnless(connection.vendor == 'sqlite', 'query plans are checked against SQLite')
+class QueryPlanTests(TestCase):
+    def test_hot_paths_use_indexes(self):
+        for label, queryset in access_paths():
+            with self.subTest(label):
+                self.assertEqual(full_scans(queryset.explain()), [])
+
+    def test_full_scan_is_detected(self):
+        self.assertEqual(full_scans('SCAN learning_question'), ['SCAN learning_question'])
+        self.assertEqual(full_scans('SEARCH learning_question USING INDEX question_topic_idx (topic=?)'), [])
+
+    def test_command_passes(self):
+        call_command('check_query_plans', stdout=StringIO())
@@ -0,0 +1,215 @@
+import platform
+import random
+import statistics
+import time
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import numpy as np
+from django.conf import settings
+from django.db import connection
+from django.test.utils import override_settings
+
+from learning import catalog, question_pool
+from learning.models import Course, Question
+from learning.question_pool import QuestionPool
+from learning.utils import DIFFICULTY_ORDER, compute_overall_points, streak_ratio
+from recommendations.ml_engine import MLService, recommend_courses
+from recommendations.services import _content_only_recommend, infer_level_and_recommend
+from roadmaps.local_ai_generator import TOPIC_STEP_BANK, generate_local_ai_roadmap
+
+
+BENCHMARK_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'benchmark'}}
+LEVELS = ['Beginner', 'Intermediate', 'Advanced']
+PROFILE_COUNT = 256
+WARMUP_CALLS = 10
+
+
+def synthetic_profiles(seed, count=PROFILE_COUNT, total_questions=10):
+    rng = random.Random(seed)
+    topics = sorted(TOPIC_STEP_BANK)
+    profiles = []
+    for index in range(count):
+        correctness = [rng.random() < 0.6 for _ in range(total_questions)]
+        correct_count = sum(correctness)
+        total_time = round(rng.uniform(5, 35) * total_questions, 2)
+        overall_points = compute_overall_points(
+            correct_count, total_questions, total_time, correctness, settings.TARGET_TIME_PER_QUESTION
+        )
+        profiles.append({
+            'user': SimpleNamespace(id=index + 1),
+            'course': SimpleNamespace(id=index + 1, topic=rng.choice(topics)),
+            'topic': rng.choice(topics),
+            'level': rng.choice(LEVELS),
+            'correctness': correctness,
+            'correct_count': correct_count,
+            'total_questions': total_questions,
+            'total_time': total_time,
+            'avg_score': correct_count / total_questions * 100,
+            'avg_time': total_time / total_questions,
+            'consistency': streak_ratio(correctness),
+            'overall_points': overall_points,
+            'interests': rng.sample(topics, 2),
+        })
+    return profiles
+
+
+def build_synthetic_bank(seed, course_count, question_count):
+    rng = random.Random(seed)
+    topics = sorted(TOPIC_STEP_BANK)
+    Course.objects.bulk_create([
+        Course(
+            title=f'Benchmark Course {index}',
+            topic=topics[index % len(topics)],
+            difficulty=DIFFICULTY_ORDER[(index // len(topics)) % len(DIFFICULTY_ORDER)],
+            description='Synthetic benchmark course.',
+            url=f'https://example.com/benchmark/{index}',
+        )
+        for index in range(course_count)
+    ], batch_size=500)
+    Question.objects.bulk_create([
+        Question(
+            topic=topics[index % len(topics)],
+            difficulty=rng.choice(DIFFICULTY_ORDER),
+            text=f'Synthetic benchmark question {index}',
+            option_a='A',
+            option_b='B',
+            option_c='C',
+            option_d='D',
+            correct_option=rng.choice('abcd'),
+            irt_discrimination=round(rng.uniform(0.5, 2.0), 3),
+        )
+        for index in range(question_count)
+    ], batch_size=500)
+    catalog.bump_catalog_version()
+    question_pool.invalidate()
+
+
+@contextmanager
+def throwaway_database():
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=False)
+    try:
+        with override_settings(CACHES=BENCHMARK_CACHES):
+            yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=False)
+
+
+def _ml_service():
+    try:
+        return MLService.get_instance(), None
+    except Exception as exc:
+        return None, f'ML artifacts unavailable: {exc}'
+
+
+def benchmark_cases(profiles):
+    ml, ml_error = _ml_service()
+    pool = QuestionPool.get_instance()
+    for profile in profiles:
+        question_ids = pool.sample(profile['topic'], k=10)
+        profile['final_form'] = (profile['topic'], question_ids, [random.choice('abcd') for _ in question_ids])
+    answer_key = pool.get_answer_key()
+
+    cases = {
+        'utils.streak_ratio': (2000, lambda p: streak_ratio(p['correctness']), None),
+        'utils.compute_overall_points': (2000, lambda p: compute_overall_points(
+            p['correct_count'], p['total_questions'], p['total_time'], p['correctness'], settings.TARGET_TIME_PER_QUESTION
+        ), None),
+        'ml.predict_level': (50, lambda p: ml.predict_level(
+            p['avg_score'], p['avg_time'], p['consistency'], p['overall_points'], p['topic']
+        ), ml_error),
+        'ml.neighbor_profile': (50, lambda p: ml.neighbor_profile(
+            p['avg_score'], p['avg_time'], p['consistency'], p['overall_points'], p['topic']
+        ), ml_error),
+        'ml.neighbor_summary': (200, lambda p: ml.neighbor_summary(
+            p['avg_score'], p['avg_time'], p['consistency'], p['overall_points'], p['topic']
+        ), ml_error),
+        'ml.recommend_courses': (50, lambda p: recommend_courses(
+            p['topic'], p['level'], p['avg_score'], p['avg_time'], p['consistency'], p['overall_points'], top_k=3
+        ), ml_error),
+        'services.infer_level_and_recommend': (200, lambda p: infer_level_and_recommend(
+            p['topic'], p['correct_count'], p['total_questions'], p['total_time'], p['correctness']
+        ), ml_error),
+        'services.content_only_recommend': (200, lambda p: _content_only_recommend(p['topic'], p['level'], top_k=3), None),
+        'roadmaps.generate_local_ai_roadmap': (500, lambda p: generate_local_ai_roadmap(
+            p['user'], p['course'], p['level'], p['overall_points'], p['interests']
+        ), None),
+        'learning.question_pool_sample': (2000, lambda p: pool.sample(p['topic'], random.choice(DIFFICULTY_ORDER), k=1), None),
+        'learning.answer_key_grade': (2000, lambda p: answer_key.grade(*p['final_form']), None),
+    }
+    return cases
+
+
+def measure(func, inputs, number, repeat):
+    for item in inputs[:WARMUP_CALLS]:
+        func(item)
+    per_call = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for index in range(number):
+            func(inputs[index % len(inputs)])
+        per_call.append((time.perf_counter() - started) / number)
+    median = statistics.median(per_call)
+    return {
+        'number': number,
+        'repeat': repeat,
+        'median_us': round(median * 1e6, 3),
+        'min_us': round(min(per_call) * 1e6, 3),
+        'mean_us': round(statistics.fmean(per_call) * 1e6, 3),
+        'stdev_us': round(statistics.pstdev(per_call) * 1e6, 3),
+        'ops_per_sec': round(1 / median, 1) if median else None,
+    }
+
+
+def run_benchmarks(seed=42, course_count=200, question_count=2000, repeat=15, number=None, only=None):
+    results = {}
+    with throwaway_database():
+        build_synthetic_bank(seed, course_count, question_count)
+        profiles = synthetic_profiles(seed)
+        for name, (default_number, func, skip_reason) in benchmark_cases(profiles).items():
+            if only and not any(name.startswith(prefix) for prefix in only):
+                continue
+            if skip_reason:
+                results[name] = {'skipped': skip_reason}
+                continue
+            random.seed(seed)
+            np.random.seed(seed)
+            results[name] = measure(func, profiles, number or default_number, repeat)
+
+    return {
+        'meta': {
+            'seed': seed,
+            'courses': course_count,
+            'questions': question_count,
+            'repeat': repeat,
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'machine': platform.machine(),
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        },
+        'results': results,
+    }
+
+
+def compare(current, baseline, threshold):
+    rows = []
+    for name, result in current['results'].items():
+        base = baseline.get('results', {}).get(name)
+        if 'skipped' in result or not base or 'skipped' in base:
+            rows.append({'name': name, 'status': 'new' if not base else 'skipped'})
+            continue
+        change = (result['median_us'] - base['median_us']) / base['median_us'] if base['median_us'] else 0.0
+        if change > threshold:
+            status = 'regression'
+        elif change < -threshold:
+            status = 'improvement'
+        else:
+            status = 'ok'
+        rows.append({
+            'name': name,
+            'status': status,
+            'baseline_us': base['median_us'],
+            'current_us': result['median_us'],
+            'change': round(change, 4),
+        })
+    return rows
@@ -0,0 +1,67 @@
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from monitoring.benchmarks import compare, run_benchmarks
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the scoring, ML, recommendation and roadmap hot paths on a synthetic catalog and question bank.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--courses', type=int, default=200, help='Synthetic courses in the throwaway database.')
+        parser.add_argument('--questions', type=int, default=2000, help='Synthetic questions in the throwaway database.')
+        parser.add_argument('--repeat', type=int, default=15, help='Timed rounds per benchmark; the median round is reported.')
+        parser.add_argument('--number', type=int, help='Calls per round; defaults to a per-benchmark value.')
+        parser.add_argument('--only', nargs='*', help='Run only benchmarks whose name starts with one of these prefixes.')
+        parser.add_argument('--output', help='Write the JSON results to this file.')
+        parser.add_argument('--compare', help='Baseline JSON file to compare against.')
+        parser.add_argument('--threshold', type=float, default=0.35, help='Relative slowdown of the median that counts as a regression.')
+
+    def handle(self, *args, **options):
+        baseline = None
+        if options['compare']:
+            try:
+                baseline = json.loads(Path(options['compare']).read_text(encoding='utf-8'))
+            except (OSError, ValueError) as exc:
+                raise CommandError(f'Could not read baseline {options["compare"]}: {exc}') from exc
+
+        report = run_benchmarks(
+            seed=options['seed'],
+            course_count=options['courses'],
+            question_count=options['questions'],
+            repeat=options['repeat'],
+            number=options['number'],
+            only=options['only'],
+        )
+
+        for name, result in report['results'].items():
+            if 'skipped' in result:
+                self.stdout.write(f'{name:<40} skipped ({result["skipped"]})')
+            else:
+                self.stdout.write(f'{name:<40} {result["median_us"]:>12.2f} us/call  {result["ops_per_sec"]:>12.1f} ops/s')
+
+        regressions = []
+        if baseline is not None:
+            report['comparison'] = compare(report, baseline, options['threshold'])
+            self.stdout.write('')
+            for row in report['comparison']:
+                if 'change' not in row:
+                    self.stdout.write(f'{row["name"]:<40} {row["status"]}')
+                    continue
+                line = f'{row["name"]:<40} {row["baseline_us"]:>12.2f} -> {row["current_us"]:>12.2f} us  {row["change"]:+.1%}  {row["status"]}'
+                if row['status'] == 'regression':
+                    regressions.append(row['name'])
+                    self.stdout.write(self.style.ERROR(line))
+                else:
+                    self.stdout.write(line)
+
+        if options['output']:
+            Path(options['output']).write_text(json.dumps(report, indent=2) + '\n', encoding='utf-8')
+            self.stdout.write(f'Results written to {options["output"]}')
+
+        if regressions:
+            raise CommandError(f'{len(regressions)} benchmark(s) regressed beyond {options["threshold"]:.0%}: {", ".join(regressions)}')
+        self.stdout.write(self.style.SUCCESS('Benchmarks finished.'))
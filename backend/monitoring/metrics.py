@@ -0,0 +1,232 @@
+import atexit
+import json
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+
+from django.conf import settings
+
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+FILE_PREFIX = 'metrics_'
+HELP = {
+    'http_request_duration_seconds': ('histogram', 'Request latency per view class.'),
+    'http_responses_total': ('counter', 'Responses per view class and status code.'),
+    'cache_requests_total': ('counter', 'Lookups per application cache and result.'),
+    'cache_hit_ratio': ('gauge', 'Hit ratio per application cache.'),
+    'ml_service_loaded': ('gauge', 'Whether the ML models are loaded in the worker process.'),
+    'ml_service_load_seconds': ('gauge', 'Time spent loading the ML models in the worker process.'),
+    'ml_service_reloads_total': ('counter', 'Background ML artifact bundle reloads per result.'),
+    'recommendation_cache_entries': ('gauge', 'Cached recommendation results in the worker process.'),
+}
+
+
+def _label_key(labels):
+    return tuple(sorted((str(name), str(value)) for name, value in (labels or {}).items()))
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(label_key, extra=()):
+    pairs = list(label_key) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _format_value(value):
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class MetricsStore:
+    _instance = None
+    _lock = threading.Lock()
+
+    def __init__(self):
+        self.pid = os.getpid()
+        self.token = uuid.uuid4().hex[:12]
+        self.started = time.time()
+        self.counters = {}
+        self.gauges = {}
+        self.histograms = {}
+        self.lock = threading.Lock()
+        self.last_flush = 0.0
+
+    @classmethod
+    def get_instance(cls):
+        if cls._instance is None or cls._instance.pid != os.getpid():
+            with cls._lock:
+                if cls._instance is None or cls._instance.pid != os.getpid():
+                    cls._instance = MetricsStore()
+                    cls._instance.start_flushing()
+        return cls._instance
+
+    def start_flushing(self):
+        if not settings.METRICS_DIR:
+            return
+        atexit.register(self.flush, force=True)
+        threading.Thread(target=self._flush_periodically, name='metrics-flush', daemon=True).start()
+
+    def _flush_periodically(self):
+        while MetricsStore._instance is self:
+            time.sleep(max(settings.METRICS_FLUSH_INTERVAL, 1.0))
+            try:
+                self.flush()
+            except OSError:
+                continue
+
+    def inc(self, name, labels=None, amount=1):
+        key = (name, _label_key(labels))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def set_gauge(self, name, value, labels=None):
+        with self.lock:
+            self.gauges[(name, _label_key(labels))] = value
+
+    def observe(self, name, value, labels=None):
+        key = (name, _label_key(labels))
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = {'buckets': [0] * (len(LATENCY_BUCKETS) + 1), 'sum': 0.0, 'count': 0}
+            index = len(LATENCY_BUCKETS)
+            for position, bound in enumerate(LATENCY_BUCKETS):
+                if value <= bound:
+                    index = position
+                    break
+            histogram['buckets'][index] += 1
+            histogram['sum'] += value
+            histogram['count'] += 1
+
+    def to_dict(self):
+        with self.lock:
+            return {
+                'pid': self.pid,
+                'started': self.started,
+                'counters': [[name, list(map(list, labels)), value] for (name, labels), value in self.counters.items()],
+                'gauges': [[name, list(map(list, labels)), value] for (name, labels), value in self.gauges.items()],
+                'histograms': [
+                    [name, list(map(list, labels)), list(item['buckets']), item['sum'], item['count']]
+                    for (name, labels), item in self.histograms.items()
+                ],
+            }
+
+    def _path(self):
+        return Path(settings.METRICS_DIR) / f'{FILE_PREFIX}{self.pid}_{self.token}.json'
+
+    def flush(self, force=False):
+        if not settings.METRICS_DIR:
+            return
+        now = time.monotonic()
+        if not force and now - self.last_flush < settings.METRICS_FLUSH_INTERVAL:
+            return
+        self.last_flush = now
+        path = self._path()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f'.{threading.get_ident()}.tmp')
+        tmp_path.write_text(json.dumps(self.to_dict()), encoding='utf-8')
+        os.replace(tmp_path, path)
+
+
+def _load_process_snapshots():
+    store = MetricsStore.get_instance()
+    if not settings.METRICS_DIR:
+        return [store.to_dict()]
+
+    store.flush(force=True)
+    latest = {}
+    for path in sorted(Path(settings.METRICS_DIR).glob(f'{FILE_PREFIX}*.json')):
+        try:
+            snapshot = json.loads(path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            continue
+        pid = snapshot['pid']
+        if not _pid_alive(pid):
+            path.unlink(missing_ok=True)
+            continue
+        previous = latest.get(pid)
+        if previous is not None:
+            if previous[1].get('started', 0) > snapshot.get('started', 0):
+                path.unlink(missing_ok=True)
+                continue
+            previous[0].unlink(missing_ok=True)
+        latest[pid] = (path, snapshot)
+    return [snapshot for _, snapshot in latest.values()]
+
+
+def collect():
+    counters = {}
+    gauges = {}
+    histograms = {}
+    for snapshot in _load_process_snapshots():
+        for name, labels, value in snapshot['counters']:
+            key = (name, tuple(map(tuple, labels)))
+            counters[key] = counters.get(key, 0) + value
+        for name, labels, value in snapshot['gauges']:
+            gauges[(name, tuple(map(tuple, labels)) + (('pid', str(snapshot['pid'])),))] = value
+        for name, labels, buckets, total, count in snapshot['histograms']:
+            key = (name, tuple(map(tuple, labels)))
+            merged = histograms.setdefault(key, {'buckets': [0] * len(buckets), 'sum': 0.0, 'count': 0})
+            merged['buckets'] = [left + right for left, right in zip(merged['buckets'], buckets)]
+            merged['sum'] += total
+            merged['count'] += count
+
+    lookups = {}
+    for (name, labels), value in counters.items():
+        if name != 'cache_requests_total':
+            continue
+        label_map = dict(labels)
+        entry = lookups.setdefault(label_map.get('cache', ''), [0, 0])
+        entry[0] += value if label_map.get('result') == 'hit' else 0
+        entry[1] += value
+    for cache_name, (hits, total) in lookups.items():
+        gauges[('cache_hit_ratio', (('cache', cache_name),))] = hits / total if total else 0.0
+
+    return counters, gauges, histograms
+
+
+def render():
+    counters, gauges, histograms = collect()
+    series = {}
+    for (name, labels), value in counters.items():
+        series.setdefault(name, []).append(f'{name}{_format_labels(labels)} {_format_value(value)}')
+    for (name, labels), value in gauges.items():
+        series.setdefault(name, []).append(f'{name}{_format_labels(labels)} {_format_value(value)}')
+    for (name, labels), item in histograms.items():
+        lines = series.setdefault(name, [])
+        cumulative = 0
+        bounds = [_format_value(float(bound)) for bound in LATENCY_BUCKETS] + ['+Inf']
+        for bound, count in zip(bounds, item['buckets']):
+            cumulative += count
+            lines.append(f'{name}_bucket{_format_labels(labels, [("le", bound)])} {cumulative}')
+        lines.append(f'{name}_sum{_format_labels(labels)} {_format_value(item["sum"])}')
+        lines.append(f'{name}_count{_format_labels(labels)} {item["count"]}')
+
+    output = []
+    for name in sorted(series):
+        metric_type, description = HELP.get(name, ('untyped', name))
+        output.append(f'# HELP {name} {description}')
+        output.append(f'# TYPE {name} {metric_type}')
+        output.extend(sorted(series[name]) if metric_type != 'histogram' else series[name])
+    return '\n'.join(output) + '\n'
+
+
+def record_cache(cache_name, hit):
+    MetricsStore.get_instance().inc('cache_requests_total', {'cache': cache_name, 'result': 'hit' if hit else 'miss'})
@@ -0,0 +1,64 @@
+import random
+import time
+
+from django.conf import settings
+from django.db import connection
+
+from .metrics import MetricsStore
+from .query_stats import QueryRecorder, QueryStats
+
+
+def _view_label(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unresolved'
+    view_class = getattr(match.func, 'view_class', None)
+    return view_class.__name__ if view_class else match.func.__name__
+
+
+class QueryStatsMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def _sampled(self):
+        rate = settings.QUERY_STATS_SAMPLE_RATE
+        return rate >= 1 or (rate > 0 and random.random() < rate)
+
+    def __call__(self, request):
+        if not self._sampled():
+            return self.get_response(request)
+
+        recorder = QueryRecorder()
+        started = time.perf_counter()
+        with connection.execute_wrapper(recorder):
+            response = self.get_response(request)
+        duration = time.perf_counter() - started
+
+        match = getattr(request, 'resolver_match', None)
+        endpoint = match.view_name if match and match.view_name else 'unresolved'
+        QueryStats.get_instance().record(endpoint, recorder, duration)
+
+        timing = (
+            f'db;dur={recorder.total_time * 1000:.2f};desc="{recorder.count} queries", '
+            f'app;dur={duration * 1000:.2f}'
+        )
+        existing = response.get('Server-Timing')
+        response['Server-Timing'] = f'{existing}, {timing}' if existing else timing
+        return response
+
+
+class MetricsMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        response = self.get_response(request)
+        duration = time.perf_counter() - started
+
+        store = MetricsStore.get_instance()
+        view = _view_label(request)
+        store.observe('http_request_duration_seconds', duration, {'view': view, 'method': request.method})
+        store.inc('http_responses_total', {'view': view, 'status': response.status_code})
+        store.flush()
+        return response
@@ -0,0 +1,126 @@
+import re
+import threading
+import time
+from collections import Counter, deque
+
+from django.conf import settings
+
+
+IN_LIST_PATTERN = re.compile(r'\(\s*(?:%s|\?)(?:\s*,\s*(?:%s|\?))*\s*\)')
+LITERAL_PATTERN = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+MAX_SQL_LENGTH = 500
+
+
+def query_signature(sql):
+    signature = IN_LIST_PATTERN.sub('(...)', sql)
+    return LITERAL_PATTERN.sub('?', signature)[:MAX_SQL_LENGTH]
+
+
+class QueryRecorder:
+    def __init__(self):
+        self.count = 0
+        self.total_time = 0.0
+        self.slowest_time = 0.0
+        self.slowest_sql = ''
+        self.signatures = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - started
+            self.count += 1
+            self.total_time += duration
+            if duration >= self.slowest_time:
+                self.slowest_time = duration
+                self.slowest_sql = sql[:MAX_SQL_LENGTH]
+            self.signatures[query_signature(sql)] += 1
+
+    def repeated(self, threshold):
+        return [(signature, count) for signature, count in self.signatures.most_common() if count >= threshold]
+
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+class QueryStats:
+    _instance = None
+    _lock = threading.Lock()
+
+    def __init__(self):
+        self.started_at = time.time()
+        self.samples = {}
+        self.samples_lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls):
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = QueryStats()
+        return cls._instance
+
+    def record(self, endpoint, recorder, duration):
+        sample = {
+            'queries': recorder.count,
+            'db_ms': recorder.total_time * 1000,
+            'duration_ms': duration * 1000,
+            'slowest_ms': recorder.slowest_time * 1000,
+            'slowest_sql': recorder.slowest_sql,
+            'repeated': recorder.repeated(settings.QUERY_STATS_REPEAT_THRESHOLD),
+        }
+        with self.samples_lock:
+            window = self.samples.get(endpoint)
+            if window is None:
+                window = self.samples[endpoint] = deque(maxlen=settings.QUERY_STATS_WINDOW)
+            window.append(sample)
+
+    def reset(self):
+        with self.samples_lock:
+            self.samples = {}
+            self.started_at = time.time()
+
+    def snapshot(self):
+        with self.samples_lock:
+            windows = {endpoint: list(window) for endpoint, window in self.samples.items()}
+
+        endpoints = []
+        for endpoint, samples in windows.items():
+            queries = [sample['queries'] for sample in samples]
+            db_ms = [sample['db_ms'] for sample in samples]
+            duration_ms = [sample['duration_ms'] for sample in samples]
+            slowest = max(samples, key=lambda sample: sample['slowest_ms'])
+            repeated = {}
+            for sample in samples:
+                for signature, count in sample['repeated']:
+                    entry = repeated.setdefault(signature, {'signature': signature, 'requests': 0, 'max_count': 0})
+                    entry['requests'] += 1
+                    entry['max_count'] = max(entry['max_count'], count)
+
+            endpoints.append({
+                'endpoint': endpoint,
+                'requests': len(samples),
+                'queries_avg': round(sum(queries) / len(queries), 2),
+                'queries_p95': _percentile(queries, 0.95),
+                'queries_max': max(queries),
+                'db_ms_avg': round(sum(db_ms) / len(db_ms), 2),
+                'db_ms_p95': round(_percentile(db_ms, 0.95), 2),
+                'duration_ms_avg': round(sum(duration_ms) / len(duration_ms), 2),
+                'duration_ms_p95': round(_percentile(duration_ms, 0.95), 2),
+                'slowest_query': {
+                    'ms': round(slowest['slowest_ms'], 2),
+                    'sql': slowest['slowest_sql'],
+                },
+                'repeated_queries': sorted(repeated.values(), key=lambda item: (-item['max_count'], item['signature'])),
+            })
+
+        endpoints.sort(key=lambda item: -item['db_ms_avg'])
+        return {
+            'since': self.started_at,
+            'sample_rate': settings.QUERY_STATS_SAMPLE_RATE,
+            'window': settings.QUERY_STATS_WINDOW,
+            'endpoints': endpoints,
+        }
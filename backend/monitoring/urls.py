@@ -0,0 +1,7 @@
+from django.urls import path
+from .views import QueryStatsView, ReadinessView
+
+urlpatterns = [
+    path('monitoring/queries', QueryStatsView.as_view(), name='monitoring-queries'),
+    path('health/ready', ReadinessView.as_view(), name='health-ready'),
+]
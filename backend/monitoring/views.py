@@ -0,0 +1,47 @@
+from django.http import HttpResponse
+from rest_framework import status
+from rest_framework.authentication import BasicAuthentication
+from rest_framework.permissions import AllowAny, IsAdminUser
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.views import APIView
+
+from recommendations.ml_engine import MLService
+
+from . import metrics
+from .query_stats import QueryStats
+
+
+class QueryStatsView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(QueryStats.get_instance().snapshot())
+
+    def delete(self, request):
+        QueryStats.get_instance().reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class ReadinessView(APIView):
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        ready = MLService.is_ready()
+        payload = {
+            'ready': ready,
+            'ml_loaded': ready,
+            'ml_version': MLService.active_version(),
+            'ml_loaded_at': MLService.loaded_at,
+            'ml_load_error': MLService.load_error,
+        }
+        return Response(payload, status=status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE)
+
+
+class MetricsView(APIView):
+    authentication_classes = [*api_settings.DEFAULT_AUTHENTICATION_CLASSES, BasicAuthentication]
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return HttpResponse(metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,75 @@
+import json
+import os
+from pathlib import Path
+
+from django.conf import settings
+
+from .compiled_forest import file_digest
+
+
+CURRENT_POINTER = 'CURRENT'
+VERSIONS_DIR = 'versions'
+MANIFEST_FILE = 'manifest.json'
+
+
+def artifact_root():
+    return Path(settings.ML_ARTIFACT_DIR)
+
+
+def resolve_bundle(root=None):
+    root = Path(root or artifact_root())
+    try:
+        version = (root / CURRENT_POINTER).read_text(encoding='utf-8').strip()
+    except FileNotFoundError:
+        return None, root
+    if not version:
+        return None, root
+    return version, root / VERSIONS_DIR / version
+
+
+def read_manifest(bundle_dir):
+    try:
+        return json.loads((Path(bundle_dir) / MANIFEST_FILE).read_text(encoding='utf-8'))
+    except FileNotFoundError:
+        return None
+
+
+def verify_bundle(bundle_dir):
+    manifest = read_manifest(bundle_dir)
+    if manifest is None:
+        return None
+    for name, digest in manifest.get('files', {}).items():
+        path = Path(bundle_dir) / name
+        if not path.exists() or file_digest(path) != digest:
+            raise ValueError(f'Artifact {name} in {bundle_dir} does not match its manifest.')
+    return manifest
+
+
+def record_artifacts(bundle_dir, directory):
+    bundle_dir = Path(bundle_dir)
+    manifest = read_manifest(bundle_dir)
+    if manifest is None:
+        return
+    files = manifest.setdefault('files', {})
+    for path in sorted(Path(directory).rglob('*')):
+        if path.is_file():
+            files[path.relative_to(bundle_dir).as_posix()] = file_digest(path)
+    tmp_path = bundle_dir / f'{MANIFEST_FILE}.tmp'
+    tmp_path.write_text(json.dumps(manifest, indent=2), encoding='utf-8')
+    os.replace(tmp_path, bundle_dir / MANIFEST_FILE)
+
+
+def publish_bundle(version, root=None):
+    root = Path(root or artifact_root())
+    if not (root / VERSIONS_DIR / version).is_dir():
+        raise FileNotFoundError(f'Artifact bundle {version} does not exist in {root / VERSIONS_DIR}.')
+    tmp_path = root / f'{CURRENT_POINTER}.tmp'
+    tmp_path.write_text(version + '\n', encoding='utf-8')
+    os.replace(tmp_path, root / CURRENT_POINTER)
+
+
+def list_bundles(root=None):
+    versions_dir = Path(root or artifact_root()) / VERSIONS_DIR
+    if not versions_dir.is_dir():
+        return []
+    return sorted(path.name for path in versions_dir.iterdir() if path.is_dir())
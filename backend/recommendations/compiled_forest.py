@@ -0,0 +1,111 @@
+import hashlib
+import json
+
+import numpy as np
+
+
+COMPILED_MODEL_DIR = 'level_model'
+ARRAY_FIELDS = ('mean', 'scale', 'feature', 'threshold', 'left', 'right', 'values', 'roots')
+META_FILE = 'meta.json'
+
+
+def file_digest(path):
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+class CompiledLevelModel:
+    def __init__(self, topics, mean, scale, feature, threshold, left, right, values, roots, max_depth, labels, source_digest=''):
+        self.topics = np.asarray(topics).astype(str)
+        self.topic_codes = {topic: code for code, topic in enumerate(self.topics.tolist())}
+        self.mean = np.asarray(mean, dtype=np.float64)
+        self.scale = np.asarray(scale, dtype=np.float64)
+        self.feature = np.asarray(feature, dtype=np.intp)
+        self.threshold = np.asarray(threshold, dtype=np.float64)
+        self.left = np.asarray(left, dtype=np.intp)
+        self.right = np.asarray(right, dtype=np.intp)
+        self.values = np.asarray(values, dtype=np.float64)
+        self.roots = np.asarray(roots, dtype=np.intp)
+        self.max_depth = int(max_depth)
+        self.labels = np.asarray(labels).astype(str)
+        self.source_digest = str(source_digest)
+
+    @classmethod
+    def compile(cls, forest, scaler, topic_encoder, skill_encoder, source_digest=''):
+        features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+        for estimator in forest.estimators_:
+            tree = estimator.tree_
+            nodes = np.arange(tree.node_count)
+            leaf = tree.children_left < 0
+            roots.append(offset)
+            features.append(np.where(leaf, 0, tree.feature))
+            thresholds.append(np.where(leaf, 0.0, tree.threshold))
+            lefts.append(np.where(leaf, nodes, tree.children_left) + offset)
+            rights.append(np.where(leaf, nodes, tree.children_right) + offset)
+            proba = tree.value[:, 0, :].astype(np.float64)
+            totals = proba.sum(axis=1, keepdims=True)
+            values.append(np.divide(proba, totals, out=np.zeros_like(proba), where=totals > 0))
+            max_depth = max(max_depth, tree.max_depth)
+            offset += tree.node_count
+
+        n_features = forest.n_features_in_
+        mean = scaler.mean_ if scaler.mean_ is not None else np.zeros(n_features)
+        scale = scaler.scale_ if scaler.scale_ is not None else np.ones(n_features)
+        return cls(
+            topics=topic_encoder.classes_,
+            mean=mean,
+            scale=scale,
+            feature=np.concatenate(features),
+            threshold=np.concatenate(thresholds),
+            left=np.concatenate(lefts),
+            right=np.concatenate(rights),
+            values=np.concatenate(values),
+            roots=roots,
+            max_depth=max_depth,
+            labels=skill_encoder.classes_[forest.classes_.astype(int)],
+            source_digest=source_digest,
+        )
+
+    def save(self, path):
+        path.mkdir(parents=True, exist_ok=True)
+        for name in ARRAY_FIELDS:
+            np.save(path / f'{name}.npy', np.ascontiguousarray(getattr(self, name)))
+        meta = {
+            'topics': self.topics.tolist(),
+            'labels': self.labels.tolist(),
+            'max_depth': self.max_depth,
+            'source_digest': self.source_digest,
+        }
+        (path / META_FILE).write_text(json.dumps(meta), encoding='utf-8')
+
+    @classmethod
+    def load(cls, path, mmap_mode='r'):
+        meta = json.loads((path / META_FILE).read_text(encoding='utf-8'))
+        arrays = {name: np.load(path / f'{name}.npy', mmap_mode=mmap_mode, allow_pickle=False) for name in ARRAY_FIELDS}
+        return cls(**arrays, **meta)
+
+    def topic_code(self, topic):
+        return self.topic_codes.get(topic, 0)
+
+    def features(self, avg_score, avg_time, consistency, overall_points, topic):
+        return np.array([[avg_score, avg_time, consistency, overall_points, self.topic_code(topic)]], dtype=np.float64)
+
+    def scale_features(self, features):
+        return (np.asarray(features, dtype=np.float64) - self.mean) / self.scale
+
+    def predict_proba(self, scaled):
+        rows = np.asarray(scaled, dtype=np.float32).astype(np.float64)
+        nodes = np.broadcast_to(self.roots, (rows.shape[0], self.roots.size)).copy()
+        row_index = np.arange(rows.shape[0])[:, None]
+        for _ in range(self.max_depth):
+            go_left = rows[row_index, self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+        return self.values[nodes].mean(axis=1)
+
+    def predict_scaled(self, scaled):
+        return self.labels[self.predict_proba(scaled).argmax(axis=1)]
+
+    def predict(self, avg_score, avg_time, consistency, overall_points, topic):
+        scaled = self.scale_features(self.features(avg_score, avg_time, consistency, overall_points, topic))
+        return str(self.predict_scaled(scaled)[0])
@@ -0,0 +1,64 @@
+import threading
+
+import numpy as np
+
+from learning import catalog
+from learning.utils import DIFFICULTY_ORDER
+
+
+DIFFICULTY_SCORES = np.array([3, 1, 0], dtype=np.int64)
+
+_matrix = None
+_matrix_lock = threading.Lock()
+
+
+class CourseMatrix:
+    def __init__(self, courses):
+        self.courses = courses
+        self.ids = np.array([course['id'] for course in courses], dtype=np.int64)
+        self.topics = sorted({course['topic'] for course in courses})
+        self.topic_codes = {topic: code for code, topic in enumerate(self.topics)}
+        lowered = sorted({topic.lower() for topic in self.topics})
+        self.lower_codes = {topic: code for code, topic in enumerate(lowered)}
+        self.topic = np.array([self.topic_codes[course['topic']] for course in courses], dtype=np.int64)
+        self.lower_topic = np.array([self.lower_codes[course['topic'].lower()] for course in courses], dtype=np.int64)
+        self.difficulty = np.array([DIFFICULTY_ORDER.index(course['difficulty']) for course in courses], dtype=np.int64)
+
+    def __len__(self):
+        return len(self.courses)
+
+    def score(self, topic, target_difficulty, dominant_difficulty, popular_topics):
+        target = DIFFICULTY_ORDER.index(target_difficulty)
+        dominant = DIFFICULTY_ORDER.index(dominant_difficulty)
+        popular = np.zeros(len(self.topics), dtype=bool)
+        popular[[self.topic_codes[name] for name in popular_topics if name in self.topic_codes]] = True
+
+        topic_match = self.lower_topic == self.lower_codes.get(topic.lower(), -1)
+        target_gap = np.abs(self.difficulty - target)
+        return (
+            4 * topic_match
+            + DIFFICULTY_SCORES[target_gap]
+            + 2 * popular[self.topic]
+            + (np.abs(self.difficulty - dominant) <= 1)
+        )
+
+    def top_k(self, scores, k):
+        order_key = scores * len(self) + (len(self) - 1 - np.arange(len(self)))
+        eligible = np.flatnonzero(scores > 0)
+        if k <= 0 or not eligible.size:
+            return eligible[:0]
+        if eligible.size > k:
+            eligible = eligible[np.argpartition(-order_key[eligible], k - 1)[:k]]
+        return eligible[np.argsort(-order_key[eligible])]
+
+
+def course_matrix():
+    global _matrix
+    version = catalog.catalog_version()
+    current = _matrix
+    if current is not None and current[0] == version:
+        return current[1]
+    with _matrix_lock:
+        if _matrix is None or _matrix[0] != version:
+            _matrix = (version, CourseMatrix(catalog.courses_by_id()))
+        return _matrix[1]
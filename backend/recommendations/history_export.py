@@ -0,0 +1,100 @@
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+from django.conf import settings
+
+from .result_cache import quantize_total_time
+
+
+STATE_FILE = 'state.json'
+PART_PATTERN = 'part-{index:06d}.npz'
+FEATURE_COLUMNS = ('attempt_id', 'avg_score', 'avg_time', 'consistency', 'overall_points', 'topic', 'skill_label')
+
+
+def longest_true_runs(positions, values, size):
+    positions = np.asarray(positions, dtype=np.intp)
+    values = np.asarray(values, dtype=bool)
+    longest = np.zeros(size, dtype=np.int64)
+    if not positions.size:
+        return longest
+    starts = np.ones(positions.size, dtype=bool)
+    starts[1:] = (positions[1:] != positions[:-1]) | (values[1:] != values[:-1])
+    run_lengths = np.bincount(np.cumsum(starts) - 1)
+    run_positions = positions[starts]
+    true_runs = values[starts]
+    np.maximum.at(longest, run_positions[true_runs], run_lengths[true_runs])
+    return longest
+
+
+def level_labels(overall_points):
+    return np.select(
+        [overall_points < 50, overall_points < 75],
+        ['Beginner', 'Intermediate'],
+        'Advanced',
+    )
+
+
+def feature_columns(attempt_ids, topics, correct_counts, total_questions, total_times, answer_positions, answer_values):
+    size = len(attempt_ids)
+    total_questions = np.maximum(np.asarray(total_questions, dtype=np.float64), 1)
+    correct_counts = np.asarray(correct_counts, dtype=np.float64)
+    total_times = quantize_total_time(np.asarray(total_times, dtype=np.float64), total_questions)
+
+    answered = np.bincount(np.asarray(answer_positions, dtype=np.intp), minlength=size)
+    streaks = longest_true_runs(answer_positions, answer_values, size)
+    consistency = np.divide(streaks, answered, out=np.zeros(size), where=answered > 0)
+
+    accuracy = correct_counts / total_questions
+    avg_time = total_times / total_questions
+    target_time = settings.TARGET_TIME_PER_QUESTION
+    time_factor = np.clip(1 - avg_time / target_time, 0.0, 1.0) if target_time > 0 else np.zeros(size)
+    overall_points = np.round(70 * accuracy + 20 * time_factor + 10 * consistency, 2)
+    return {
+        'attempt_id': np.asarray(attempt_ids, dtype=np.int64),
+        'avg_score': accuracy * 100,
+        'avg_time': avg_time,
+        'consistency': consistency,
+        'overall_points': overall_points,
+        'topic': np.asarray(topics).astype(str),
+        'skill_label': level_labels(overall_points),
+    }
+
+
+class HistoryStore:
+    def __init__(self, path):
+        self.path = Path(path)
+
+    def read_state(self):
+        try:
+            return json.loads((self.path / STATE_FILE).read_text(encoding='utf-8'))
+        except FileNotFoundError:
+            return {'last_attempt_id': 0, 'rows': 0, 'parts': []}
+
+    def _write_state(self, state):
+        tmp_path = self.path / f'{STATE_FILE}.tmp'
+        tmp_path.write_text(json.dumps(state, indent=2), encoding='utf-8')
+        os.replace(tmp_path, self.path / STATE_FILE)
+
+    def append(self, columns):
+        rows = len(columns['attempt_id'])
+        if not rows:
+            return self.read_state()
+        self.path.mkdir(parents=True, exist_ok=True)
+        state = self.read_state()
+        name = PART_PATTERN.format(index=len(state['parts']) + 1)
+        tmp_path = self.path / f'{name}.tmp'
+        with tmp_path.open('wb') as handle:
+            np.savez(handle, **{column: columns[column] for column in FEATURE_COLUMNS})
+        os.replace(tmp_path, self.path / name)
+        state['parts'].append({'file': name, 'rows': rows, 'last_attempt_id': int(columns['attempt_id'][-1])})
+        state['rows'] += rows
+        state['last_attempt_id'] = int(columns['attempt_id'][-1])
+        self._write_state(state)
+        return state
+
+    def reset(self):
+        for part in self.read_state()['parts']:
+            (self.path / part['file']).unlink(missing_ok=True)
+        (self.path / STATE_FILE).unlink(missing_ok=True)
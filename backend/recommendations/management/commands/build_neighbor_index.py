@@ -0,0 +1,55 @@
+import time
+
+import numpy as np
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from recommendations.artifacts import record_artifacts
+from recommendations.ml_engine import MLService
+from recommendations.neighbor_index import NEIGHBOR_INDEX_DIR
+
+
+TIMING_CALLS = 500
+
+
+class Command(BaseCommand):
+    help = 'Build the partitioned learner-history neighbour index for the active ML bundle and compare it with exact KNN.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--neighbors', type=int, default=5)
+        parser.add_argument('--min-agreement', type=float, default=0.9, help='Fail when agreement with exact KNN drops below this share.')
+        parser.add_argument('--bundle', help='Artifact directory to use instead of the active bundle.')
+        parser.add_argument('--check-only', action='store_true', help='Compare with exact KNN without writing the index.')
+
+    def handle(self, *args, **options):
+        bundle = options['bundle']
+        try:
+            ml = MLService(bundle_dir=bundle) if bundle else MLService()
+        except Exception as exc:
+            raise CommandError(f'Could not load ML artifacts from {bundle or settings.ML_ARTIFACT_DIR}: {exc}') from exc
+
+        k = options['neighbors']
+        index = ml.build_neighbor_index()
+        scaled = np.asarray(ml.knn._fit_X)
+        self.stdout.write(f'Rows: {index.rows}, cells: {len(index.centroids)}, cell width: {index.cell_width:.3f}')
+
+        exact_topics, exact_skills = ml.neighbor_counts_scaled(scaled, n_neighbors=k)
+        topic_counts, skill_counts = index.summarize(scaled, n_neighbors=k)
+
+        topic_agreement = float(((topic_counts > 0) == (exact_topics > 0)).all(axis=1).mean())
+        skill_agreement = float((skill_counts.argmax(axis=1) == exact_skills.argmax(axis=1)).mean())
+        self.stdout.write(f'Topic set agreement with exact KNN: {topic_agreement:.1%}, dominant skill agreement: {skill_agreement:.1%}')
+        if min(topic_agreement, skill_agreement) < options['min_agreement']:
+            raise CommandError('Neighbour index does not match exact KNN.')
+
+        started = time.perf_counter()
+        for row in scaled[:TIMING_CALLS]:
+            index.summary(row, n_neighbors=k)
+        self.stdout.write(f'Single query: {(time.perf_counter() - started) / min(TIMING_CALLS, len(scaled)) * 1e6:.1f} us')
+
+        if options['check_only']:
+            return
+        output = ml.artifact_dir / NEIGHBOR_INDEX_DIR
+        index.save(output)
+        record_artifacts(ml.artifact_dir, output)
+        self.stdout.write(self.style.SUCCESS(f'Neighbour index saved to: {output}'))
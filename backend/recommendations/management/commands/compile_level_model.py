@@ -0,0 +1,80 @@
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from recommendations.artifacts import record_artifacts
+from recommendations.compiled_forest import COMPILED_MODEL_DIR
+from recommendations.ml_engine import MLService
+
+
+FEATURE_COLUMNS = ['avg_score', 'avg_time', 'consistency', 'overall_points']
+TIMING_CALLS = 200
+
+
+class Command(BaseCommand):
+    help = 'Flatten the trained random forest, scaler and encoders into NumPy arrays and verify parity with sklearn.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dataset',
+            default=str(settings.BASE_DIR.parent / 'dataset' / 'learner_history.csv'),
+            help='Rows used for the parity check against sklearn.',
+        )
+        parser.add_argument('--bundle', help='Artifact directory to use instead of the active bundle.')
+        parser.add_argument('--check-only', action='store_true', help='Verify parity without writing the compiled model.')
+
+    def handle(self, *args, **options):
+        bundle = options['bundle']
+        try:
+            ml = MLService(bundle_dir=bundle) if bundle else MLService()
+        except Exception as exc:
+            raise CommandError(f'Could not load ML artifacts from {bundle or settings.ML_ARTIFACT_DIR}: {exc}') from exc
+        forest = ml.load_random_forest()
+        model = ml.compile_level_model(forest)
+
+        dataset_path = Path(options['dataset'])
+        if not dataset_path.exists():
+            raise CommandError(f'Parity dataset missing: {dataset_path}')
+        df = pd.read_csv(dataset_path)
+        topics = df['topic'].where(df['topic'].isin(ml.topic_encoder.classes_), ml.topic_encoder.classes_[0])
+        features = np.column_stack([df[FEATURE_COLUMNS].to_numpy(dtype=float), ml.topic_encoder.transform(topics)])
+
+        scaled = ml.scaler.transform(features)
+        expected_proba = forest.predict_proba(scaled)
+        expected = ml.skill_encoder.inverse_transform(forest.predict(scaled).astype(int))
+        compiled_scaled = model.scale_features(features)
+        actual_proba = model.predict_proba(compiled_scaled)
+        actual = model.predict_scaled(compiled_scaled)
+
+        mismatches = int((expected != actual).sum())
+        max_error = float(np.abs(expected_proba - actual_proba).max())
+        self.stdout.write(f'Parity rows: {len(df)}, label mismatches: {mismatches}, max probability error: {max_error:.2e}')
+        if mismatches or max_error > 1e-9:
+            raise CommandError('Compiled model does not match sklearn predictions.')
+
+        row = df.iloc[0]
+        args = (row['avg_score'], row['avg_time'], row['consistency'], row['overall_points'], row['topic'])
+        started = time.perf_counter()
+        for _ in range(TIMING_CALLS):
+            ml.skill_encoder.inverse_transform(
+                forest.predict(ml.scaler.transform(ml._build_feature(*args))).astype(int)
+            )
+        sklearn_us = (time.perf_counter() - started) / TIMING_CALLS * 1e6
+        started = time.perf_counter()
+        for _ in range(TIMING_CALLS):
+            model.predict(*args)
+        compiled_us = (time.perf_counter() - started) / TIMING_CALLS * 1e6
+        self.stdout.write(f'Single-row predict: sklearn {sklearn_us:.1f} us, compiled {compiled_us:.1f} us ({sklearn_us / compiled_us:.0f}x)')
+
+        if options['check_only']:
+            self.stdout.write(self.style.SUCCESS('Parity check passed.'))
+            return
+
+        output = ml.artifact_dir / COMPILED_MODEL_DIR
+        model.save(output)
+        record_artifacts(ml.artifact_dir, output)
+        self.stdout.write(self.style.SUCCESS(f'Compiled level model saved to: {output}'))
@@ -0,0 +1,98 @@
+import time
+from datetime import timedelta
+
+import numpy as np
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from learning.models import AssessmentAnswer, AssessmentAttempt
+from recommendations.history_export import FEATURE_COLUMNS, HistoryStore, feature_columns
+
+
+class Command(BaseCommand):
+    help = 'Append features of newly finished assessment attempts to the columnar learner-history dataset.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', default=settings.LEARNER_HISTORY_DIR)
+        parser.add_argument('--chunk-size', type=int, default=5000, help='Attempts read and featurized per query.')
+        parser.add_argument('--part-rows', type=int, default=200000, help='Rows buffered before a part file is written.')
+        parser.add_argument('--full', action='store_true', help='Delete the exported parts and start from the first attempt.')
+
+    def _horizon(self):
+        open_since = timezone.now() - timedelta(seconds=settings.ASSESSMENT_SESSION_TTL)
+        return (
+            AssessmentAttempt.objects.filter(finished_at__isnull=True, started_at__gte=open_since)
+            .order_by('id')
+            .values_list('id', flat=True)
+            .first()
+        )
+
+    def _featurize(self, rows, chunk_size):
+        attempt_ids, topics, correct_counts, total_questions, total_times = (np.array(column) for column in zip(*rows))
+        answers = (
+            AssessmentAnswer.objects.filter(attempt_id__gte=attempt_ids[0], attempt_id__lte=attempt_ids[-1])
+            .order_by('attempt_id', 'id')
+            .values_list('attempt_id', 'is_correct')
+            .iterator(chunk_size=chunk_size)
+        )
+        answer_ids, answer_values = [], []
+        for attempt_id, is_correct in answers:
+            answer_ids.append(attempt_id)
+            answer_values.append(is_correct)
+        answer_ids = np.array(answer_ids, dtype=np.int64)
+        answer_values = np.array(answer_values, dtype=bool)
+
+        positions = np.minimum(np.searchsorted(attempt_ids, answer_ids), len(attempt_ids) - 1)
+        known = attempt_ids[positions] == answer_ids
+        return feature_columns(
+            attempt_ids, topics, correct_counts, total_questions, total_times, positions[known], answer_values[known]
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        if chunk_size <= 0 or options['part_rows'] <= 0:
+            raise CommandError('--chunk-size and --part-rows must be positive.')
+
+        store = HistoryStore(options['output'])
+        if options['full']:
+            store.reset()
+        state = store.read_state()
+        last_id = state['last_attempt_id']
+        horizon = self._horizon()
+        self.stdout.write(f'Exporting attempts after id {last_id}' + (f' and before open attempt {horizon}' if horizon else ''))
+
+        attempts = AssessmentAttempt.objects.filter(finished_at__isnull=False)
+        if horizon:
+            attempts = attempts.filter(id__lt=horizon)
+
+        buffered = []
+        buffered_rows = 0
+        exported = 0
+        started = time.perf_counter()
+        while True:
+            rows = list(
+                attempts.filter(id__gt=last_id)
+                .order_by('id')
+                .values_list('id', 'topic', 'correct_count', 'total_questions', 'total_time')[:chunk_size]
+                .iterator(chunk_size=chunk_size)
+            )
+            if rows:
+                buffered.append(self._featurize(rows, chunk_size))
+                buffered_rows += len(rows)
+                last_id = rows[-1][0]
+            if buffered and (not rows or buffered_rows >= options['part_rows']):
+                state = store.append({name: np.concatenate([part[name] for part in buffered]) for name in FEATURE_COLUMNS})
+                exported += buffered_rows
+                buffered = []
+                buffered_rows = 0
+                elapsed = time.perf_counter() - started
+                self.stdout.write(
+                    f'Exported {exported} attempt(s) up to id {last_id}, {exported / elapsed if elapsed else 0:.0f} rows/s'
+                )
+            if not rows:
+                break
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Learner history export finished. New rows: {exported}, total rows: {state["rows"]}, watermark: {state["last_attempt_id"]}'
+        ))
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from recommendations.artifacts import (
+    VERSIONS_DIR,
+    artifact_root,
+    list_bundles,
+    publish_bundle,
+    read_manifest,
+    resolve_bundle,
+    verify_bundle,
+)
+
+
+class Command(BaseCommand):
+    help = 'List versioned ML artifact bundles or point CURRENT at one of them.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('version', nargs='?', help='Bundle to publish. Omit to list bundles.')
+
+    def handle(self, *args, **options):
+        current, _ = resolve_bundle()
+        version = options['version']
+        if not version:
+            bundles = list_bundles()
+            if not bundles:
+                self.stdout.write(f'No versioned bundles in {artifact_root() / VERSIONS_DIR}.')
+            for name in bundles:
+                manifest = read_manifest(artifact_root() / VERSIONS_DIR / name) or {}
+                marker = '*' if name == current else ' '
+                self.stdout.write(f'{marker} {name}  {manifest.get("created_at", "")}  {manifest.get("metrics", {})}')
+            return
+
+        try:
+            verify_bundle(artifact_root() / VERSIONS_DIR / version)
+            publish_bundle(version)
+        except (OSError, ValueError) as exc:
+            raise CommandError(str(exc)) from exc
+        self.stdout.write(self.style.SUCCESS(f'CURRENT now points to {version} (was {current or "flat artifacts"}).'))
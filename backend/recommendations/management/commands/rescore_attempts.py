@@ -0,0 +1,119 @@
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from learning.models import AssessmentAnswer, AssessmentAttempt
+from recommendations.ml_engine import MLService
+from recommendations.services import learner_features
+
+
+CHECKPOINT_FILE = 'erudition_rescore_checkpoint.json'
+
+
+class Command(BaseCommand):
+    help = 'Re-score the predicted level of finished assessment attempts with the current model.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000)
+        parser.add_argument('--resume', action='store_true', help='Continue after the last attempt id in the checkpoint.')
+        parser.add_argument('--start-after', type=int, default=0, help='Only re-score attempts with a larger id.')
+        parser.add_argument('--checkpoint', default=str(Path(tempfile.gettempdir()) / CHECKPOINT_FILE))
+        parser.add_argument('--dry-run', action='store_true', help='Score attempts without writing predicted levels.')
+
+    def _read_checkpoint(self, path, digest):
+        try:
+            checkpoint = json.loads(path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return 0
+        if checkpoint.get('model_digest') != digest:
+            self.stdout.write(self.style.WARNING('Checkpoint belongs to a different model. Starting from the beginning.'))
+            return 0
+        return int(checkpoint.get('last_attempt_id', 0))
+
+    def _write_checkpoint(self, path, digest, last_id):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix('.tmp')
+        tmp_path.write_text(json.dumps({'model_digest': digest, 'last_attempt_id': last_id}), encoding='utf-8')
+        tmp_path.replace(path)
+
+    def _score_chunk(self, ml, rows):
+        correctness = {row[0]: [] for row in rows}
+        answers = (
+            AssessmentAnswer.objects.filter(attempt_id__in=list(correctness))
+            .order_by('attempt_id', 'id')
+            .values_list('attempt_id', 'is_correct')
+        )
+        for attempt_id, is_correct in answers:
+            correctness[attempt_id].append(is_correct)
+
+        columns = {'avg_score': [], 'avg_time': [], 'consistency': [], 'overall_points': []}
+        for attempt_id, _, correct_count, total_questions, total_time, _ in rows:
+            features = learner_features(correct_count, total_questions, total_time, correctness[attempt_id])
+            for name, values in columns.items():
+                values.append(features[name])
+        matrix = ml.feature_matrix(
+            columns['avg_score'],
+            columns['avg_time'],
+            columns['consistency'],
+            columns['overall_points'],
+            [row[1] for row in rows],
+        )
+        return ml.predict_levels_batch(matrix)
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        if chunk_size <= 0:
+            raise CommandError('--chunk-size must be positive.')
+        try:
+            ml = MLService.get_instance()
+        except Exception as exc:
+            raise CommandError(f'Could not load ML artifacts from {settings.ML_ARTIFACT_DIR}: {exc}') from exc
+
+        checkpoint_path = Path(options['checkpoint'])
+        last_id = options['start_after']
+        if options['resume']:
+            last_id = max(last_id, self._read_checkpoint(checkpoint_path, ml.forest_digest))
+            self.stdout.write(f'Resuming after attempt {last_id}')
+
+        scored = 0
+        changed = 0
+        started = time.perf_counter()
+        while True:
+            rows = list(
+                AssessmentAttempt.objects.filter(finished_at__isnull=False, id__gt=last_id)
+                .order_by('id')
+                .values_list('id', 'topic', 'correct_count', 'total_questions', 'total_time', 'predicted_level')[:chunk_size]
+            )
+            if not rows:
+                break
+
+            levels = self._score_chunk(ml, rows)
+            updates = [
+                AssessmentAttempt(id=row[0], predicted_level=str(level))
+                for row, level in zip(rows, levels)
+                if row[5] != level
+            ]
+            if updates and not options['dry_run']:
+                with transaction.atomic():
+                    AssessmentAttempt.objects.bulk_update(updates, ['predicted_level'], batch_size=500)
+
+            last_id = rows[-1][0]
+            scored += len(rows)
+            changed += len(updates)
+            if not options['dry_run']:
+                self._write_checkpoint(checkpoint_path, ml.forest_digest, last_id)
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f'Scored {scored} attempt(s) up to id {last_id}, {changed} changed, {scored / elapsed if elapsed else 0:.0f} rows/s'
+            )
+
+        elapsed = time.perf_counter() - started
+        action = 'would change' if options['dry_run'] else 'changed'
+        self.stdout.write(self.style.SUCCESS(
+            f'Re-scoring finished. Scored: {scored}, {action}: {changed}, {scored / elapsed if elapsed else 0:.0f} rows/s'
+        ))
@@ -0,0 +1,24 @@
+# Generated by Django 5.1.4 on 2026-10-18 01:52
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning', '0006_assessmentattempt_attempt_user_course_fin_idx_and_more'),
+        ('recommendations', '0002_feedbackresponse_feedback_type'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='feedbackresponse',
+            index=models.Index(fields=['user', 'final_attempt', 'feedback_type'], name='feedback_user_attempt_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='recommendationlog',
+            index=models.Index(fields=['attempt', 'created_at'], name='reclog_attempt_created_idx'),
+        ),
+    ]
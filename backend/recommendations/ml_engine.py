@@ -1,11 +1,20 @@
+import json
+import logging
+import threading
+import time
 from pathlib import Path
 import numpy as np
-import pandas as pd
 import joblib
 from django.conf import settings
-from learning.models import Course
+from monitoring.metrics import MetricsStore
+from .artifacts import resolve_bundle, verify_bundle
+from .compiled_forest import COMPILED_MODEL_DIR, CompiledLevelModel, file_digest
+from .course_matrix import course_matrix
+from .neighbor_index import NEIGHBOR_INDEX_DIR, NeighborIndex
 
 
+logger = logging.getLogger(__name__)
+
 LEVEL_TO_DIFFICULTY = {
     'Beginner': 'easy',
     'Intermediate': 'medium',
@@ -15,45 +24,223 @@ LEVEL_TO_DIFFICULTY = {
 
 class MLService:
     _instance = None
+    _lock = threading.Lock()
+    _reload_lock = threading.Lock()
+    _reloading = False
+    _checked_at = 0.0
+    _failed_version = None
+    loaded_at = None
+    load_error = None
+
+    def __init__(self, bundle_dir=None, version=None):
+        if bundle_dir is None:
+            version, bundle_dir = resolve_bundle()
+        self.version = version
+        self.artifact_dir = Path(bundle_dir)
+        self.manifest = verify_bundle(self.artifact_dir)
+        self._knn = None
+        self.scaler = joblib.load(self.artifact_dir / 'scaler.joblib')
+        self.topic_encoder = joblib.load(self.artifact_dir / 'topic_encoder.joblib')
+        self.skill_encoder = joblib.load(self.artifact_dir / 'skill_encoder.joblib')
+        self.history_topic_codes, self.history_skill_codes, self.history_topics, self.history_skills = self._load_history()
+        self.forest_digest = file_digest(self.artifact_dir / 'random_forest.joblib')
+        self.level_model = self._load_level_model()
+        self.knn_digest = file_digest(self.artifact_dir / 'knn.joblib')
+        self.neighbor_index = self._load_neighbor_index()
+
+    def _load_history(self):
+        codes_path = self.artifact_dir / 'history_codes.json'
+        if not codes_path.exists():
+            history_meta = joblib.load(self.artifact_dir / 'history_meta.joblib')
+            topics, topic_codes = np.unique(history_meta['topic'].to_numpy().astype(str), return_inverse=True)
+            skills, skill_codes = np.unique(history_meta['skill_label'].to_numpy().astype(str), return_inverse=True)
+            return topic_codes.astype(np.uint8), skill_codes.astype(np.uint8), topics, skills
+        tables = json.loads(codes_path.read_text(encoding='utf-8'))
+        return (
+            np.load(self.artifact_dir / 'history_topic.npy', mmap_mode='r', allow_pickle=False),
+            np.load(self.artifact_dir / 'history_skill.npy', mmap_mode='r', allow_pickle=False),
+            np.asarray(tables['topics']).astype(str),
+            np.asarray(tables['skill_labels']).astype(str),
+        )
+
+    def _load_level_model(self):
+        compiled_path = self.artifact_dir / COMPILED_MODEL_DIR
+        if compiled_path.exists():
+            try:
+                model = CompiledLevelModel.load(compiled_path)
+            except (OSError, ValueError, TypeError, KeyError):
+                model = None
+            if model is not None and model.source_digest == self.forest_digest:
+                return model
+        return self.compile_level_model()
+
+    def _load_neighbor_index(self):
+        index_path = self.artifact_dir / NEIGHBOR_INDEX_DIR
+        if index_path.exists():
+            try:
+                index = NeighborIndex.load(index_path)
+            except (OSError, ValueError, TypeError, KeyError):
+                index = None
+            if (
+                index is not None
+                and index.source_digest == self.knn_digest
+                and index.cell_budget == settings.ML_NEIGHBOR_CELL_BUDGET
+            ):
+                return index
+        return self.build_neighbor_index()
 
-    def __init__(self):
-        artifact_dir = Path(settings.ML_ARTIFACT_DIR)
-        self.random_forest = joblib.load(artifact_dir / 'random_forest.joblib')
-        self.decision_tree = joblib.load(artifact_dir / 'decision_tree.joblib')
-        self.knn = joblib.load(artifact_dir / 'knn.joblib')
-        self.scaler = joblib.load(artifact_dir / 'scaler.joblib')
-        self.topic_encoder = joblib.load(artifact_dir / 'topic_encoder.joblib')
-        self.skill_encoder = joblib.load(artifact_dir / 'skill_encoder.joblib')
-        self.history_meta = joblib.load(artifact_dir / 'history_meta.joblib')
+    def build_neighbor_index(self):
+        return NeighborIndex.build(
+            self.knn._fit_X,
+            self.history_topic_codes,
+            self.history_skill_codes,
+            self.history_topics,
+            self.history_skills,
+            cell_budget=settings.ML_NEIGHBOR_CELL_BUDGET,
+            source_digest=self.knn_digest,
+        )
+
+    @property
+    def knn(self):
+        if self._knn is None:
+            self._knn = joblib.load(self.artifact_dir / 'knn.joblib', mmap_mode='r')
+        return self._knn
+
+    def load_random_forest(self):
+        return joblib.load(self.artifact_dir / 'random_forest.joblib')
+
+    def compile_level_model(self, random_forest=None):
+        return CompiledLevelModel.compile(
+            random_forest or self.load_random_forest(),
+            self.scaler,
+            self.topic_encoder,
+            self.skill_encoder,
+            source_digest=self.forest_digest,
+        )
+
+    @classmethod
+    def _activate(cls, instance, started):
+        cls._instance = instance
+        cls.loaded_at = time.time()
+        cls.load_error = None
+        cls._failed_version = None
+        store = MetricsStore.get_instance()
+        store.set_gauge('ml_service_loaded', 1)
+        store.set_gauge('ml_service_load_seconds', time.perf_counter() - started)
 
     @classmethod
     def get_instance(cls):
-        if cls._instance is None:
-            cls._instance = MLService()
+        instance = cls._instance
+        if instance is not None:
+            cls._check_for_update(instance)
+            return instance
+
+        with cls._lock:
+            if cls._instance is None:
+                started = time.perf_counter()
+                try:
+                    instance = MLService()
+                except Exception as exc:
+                    cls.load_error = str(exc)
+                    raise
+                cls._activate(instance, started)
         return cls._instance
 
+    @classmethod
+    def _check_for_update(cls, instance):
+        interval = settings.ML_RELOAD_INTERVAL
+        now = time.monotonic()
+        if interval <= 0 or now - cls._checked_at < interval:
+            return
+        cls._checked_at = now
+        version, _ = resolve_bundle()
+        if version is None or version in (instance.version, cls._failed_version):
+            return
+        with cls._reload_lock:
+            if cls._reloading:
+                return
+            cls._reloading = True
+        threading.Thread(target=cls._reload, name='ml-reload', daemon=True).start()
+
+    @classmethod
+    def _reload(cls):
+        started = time.perf_counter()
+        version, bundle_dir = resolve_bundle()
+        try:
+            instance = MLService(bundle_dir, version)
+        except Exception as exc:
+            cls._failed_version = version
+            cls.load_error = f'{version}: {exc}'
+            MetricsStore.get_instance().inc('ml_service_reloads_total', {'result': 'failed'})
+            logger.warning('ML artifact bundle %s could not be loaded: %s', version, exc)
+        else:
+            cls._activate(instance, started)
+            MetricsStore.get_instance().inc('ml_service_reloads_total', {'result': 'loaded'})
+            logger.info('ML artifact bundle %s loaded.', version)
+        finally:
+            with cls._reload_lock:
+                cls._reloading = False
+
+    @classmethod
+    def is_ready(cls):
+        return cls._instance is not None
+
+    @classmethod
+    def active_version(cls):
+        instance = cls._instance
+        return instance.version if instance is not None else None
+
+    def feature_matrix(self, avg_scores, avg_times, consistencies, overall_points, topics):
+        topic_codes = [self.level_model.topic_code(topic) for topic in topics]
+        return np.column_stack([avg_scores, avg_times, consistencies, overall_points, topic_codes]).astype(float)
+
     def _build_feature(self, avg_score, avg_time, consistency, overall_points, topic):
-        safe_topic = topic if topic in self.topic_encoder.classes_ else self.topic_encoder.classes_[0]
-        topic_encoded = self.topic_encoder.transform([safe_topic])[0]
-        return np.array([[avg_score, avg_time, consistency, overall_points, topic_encoded]], dtype=float)
+        return self.level_model.features(avg_score, avg_time, consistency, overall_points, topic)
 
     def predict_level(self, avg_score, avg_time, consistency, overall_points, topic):
-        feature = self._build_feature(avg_score, avg_time, consistency, overall_points, topic)
-        scaled = self.scaler.transform(feature)
+        return self.level_model.predict(avg_score, avg_time, consistency, overall_points, topic)
 
-        rf_pred = self.random_forest.predict(scaled)[0]
-        dt_pred = self.decision_tree.predict(scaled)[0]
-
-        pred = rf_pred if rf_pred == dt_pred else rf_pred
-        level = self.skill_encoder.inverse_transform([int(pred)])[0]
-        return level
+    def predict_levels_batch(self, features):
+        return self.level_model.predict_scaled(self.level_model.scale_features(features))
 
     def neighbor_profile(self, avg_score, avg_time, consistency, overall_points, topic, n_neighbors=5):
         feature = self._build_feature(avg_score, avg_time, consistency, overall_points, topic)
-        scaled = self.scaler.transform(feature)
+        topic_counts, skill_counts = self.neighbor_profiles_batch(feature, n_neighbors=n_neighbors)
+        return (
+            {str(self.history_topics[code]): int(count) for code, count in enumerate(topic_counts[0]) if count},
+            {str(self.history_skills[code]): int(count) for code, count in enumerate(skill_counts[0]) if count},
+        )
+
+    def neighbor_summary(self, avg_score, avg_time, consistency, overall_points, topic, n_neighbors=5):
+        feature = self._build_feature(avg_score, avg_time, consistency, overall_points, topic)
+        return self.neighbor_index.summary(self.level_model.scale_features(feature), n_neighbors=n_neighbors)
+
+    def neighbor_summaries_batch(self, features, n_neighbors=5):
+        return self.neighbor_index.summarize(self.level_model.scale_features(features), n_neighbors=n_neighbors)
+
+    def neighbor_profiles_batch(self, features, n_neighbors=5):
+        return self.neighbor_counts_scaled(self.level_model.scale_features(features), n_neighbors=n_neighbors)
+
+    def neighbor_counts_scaled(self, scaled, n_neighbors=5):
         _, indices = self.knn.kneighbors(scaled, n_neighbors=n_neighbors)
-        meta = self.history_meta.iloc[indices[0]]
-        return meta
+        return (
+            _count_codes(self.history_topic_codes[indices], len(self.history_topics)),
+            _count_codes(self.history_skill_codes[indices], len(self.history_skills)),
+        )
+
+
+def _count_codes(codes, size):
+    offsets = np.arange(codes.shape[0])[:, None] * size
+    return np.bincount((codes + offsets).ravel(), minlength=codes.shape[0] * size).reshape(codes.shape[0], size)
+
+
+def warm_up():
+    try:
+        MLService.get_instance()
+    except Exception as exc:
+        logger.warning('ML models could not be loaded from %s: %s', settings.ML_ARTIFACT_DIR, exc)
+        return False
+    return True
 
 
 def align_difficulty_score(course_difficulty, target_difficulty):
@@ -68,56 +255,46 @@ def align_difficulty_score(course_difficulty, target_difficulty):
     return 0
 
 
-def recommend_courses(topic, level, avg_score, avg_time, consistency, overall_points, top_k=5):
-    ml = MLService.get_instance()
-    neighbors = ml.neighbor_profile(avg_score, avg_time, consistency, overall_points, topic)
-    neighbor_topic_counts = neighbors['topic'].value_counts().to_dict()
-    neighbor_skill_counts = neighbors['skill_label'].value_counts().to_dict()
+def _recommendation_reasons(course, topic, level, target_difficulty, dominant_difficulty, neighbor_topic_counts):
+    reasons = []
+    if course['topic'].lower() == topic.lower():
+        reasons.append('Matches your selected topic')
+    diff_score = align_difficulty_score(course['difficulty'], target_difficulty)
+    if diff_score >= 3:
+        reasons.append(f"Aligned with your current level ({level})")
+    elif diff_score == 1:
+        reasons.append('Slightly challenges your current level')
+    if neighbor_topic_counts.get(course['topic'], 0) > 0:
+        reasons.append('Popular among learners with similar performance')
+    if align_difficulty_score(course['difficulty'], dominant_difficulty) >= 1:
+        reasons.append('Fits paths taken by similar learners')
+    return '; '.join(dict.fromkeys(reasons)) or 'Strong overall fit for your profile'
+
+
+def recommend_courses(topic, level, avg_score, avg_time, consistency, overall_points, top_k=5, ml=None):
+    ml = ml or MLService.get_instance()
+    neighbor_topic_counts, neighbor_skill_counts = ml.neighbor_summary(avg_score, avg_time, consistency, overall_points, topic)
     dominant_skill = max(neighbor_skill_counts, key=neighbor_skill_counts.get)
 
     target_difficulty = LEVEL_TO_DIFFICULTY.get(level, 'easy')
     dominant_difficulty = LEVEL_TO_DIFFICULTY.get(dominant_skill, target_difficulty)
 
-    scored = []
-    for course in Course.objects.all():
-        reasons = []
-        score = 0
-
-        if course.topic.lower() == topic.lower():
-            score += 4
-            reasons.append('Matches your selected topic')
-
-        diff_score = align_difficulty_score(course.difficulty, target_difficulty)
-        score += diff_score
-        if diff_score >= 3:
-            reasons.append(f"Aligned with your current level ({level})")
-        elif diff_score == 1:
-            reasons.append('Slightly challenges your current level')
-
-        if neighbor_topic_counts.get(course.topic, 0) > 0:
-            score += 2
-            reasons.append('Popular among learners with similar performance')
-
-        if align_difficulty_score(course.difficulty, dominant_difficulty) >= 1:
-            score += 1
-            reasons.append('Fits paths taken by similar learners')
-
-        if score > 0:
-            scored.append(
-                {
-                    'id': course.id,
-                    'title': course.title,
-                    'topic': course.topic,
-                    'difficulty': course.difficulty,
-                    'description': course.description,
-                    'url': course.url,
-                    'why_recommended': '; '.join(dict.fromkeys(reasons)) or 'Strong overall fit for your profile',
-                    '_score': score,
-                }
-            )
-
-    scored.sort(key=lambda item: item['_score'], reverse=True)
-    results = scored[:top_k]
-    for item in results:
-        item.pop('_score', None)
+    matrix = course_matrix()
+    scores = matrix.score(topic, target_difficulty, dominant_difficulty, neighbor_topic_counts)
+    results = []
+    for row in matrix.top_k(scores, top_k):
+        course = matrix.courses[row]
+        results.append(
+            {
+                'id': course['id'],
+                'title': course['title'],
+                'topic': course['topic'],
+                'difficulty': course['difficulty'],
+                'description': course['description'],
+                'url': course['url'],
+                'why_recommended': _recommendation_reasons(
+                    course, topic, level, target_difficulty, dominant_difficulty, neighbor_topic_counts
+                ),
+            }
+        )
     return results
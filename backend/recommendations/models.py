@@ -8,6 +8,11 @@ class RecommendationLog(models.Model):
     courses_json = models.JSONField(default=list)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['attempt', 'created_at'], name='reclog_attempt_created_idx'),
+        ]
+
     def __str__(self):
         return f"RecommendationLog {self.id}"
 
@@ -40,5 +45,10 @@ class FeedbackResponse(models.Model):
     feedback_type = models.CharField(max_length=20, choices=FEEDBACK_TYPE_CHOICES, default='PASS_FEEDBACK')
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'final_attempt', 'feedback_type'], name='feedback_user_attempt_type_idx'),
+        ]
+
     def __str__(self):
         return f"Feedback {self.id} - {self.user.email}"
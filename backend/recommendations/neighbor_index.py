@@ -0,0 +1,110 @@
+import json
+
+import numpy as np
+from sklearn.neighbors import KDTree
+
+
+NEIGHBOR_INDEX_DIR = 'neighbor_index'
+ARRAY_FIELDS = ('centroids', 'counts', 'topic_hist', 'skill_hist')
+META_FILE = 'meta.json'
+START_CELL_WIDTH = 0.05
+CELL_WIDTH_GROWTH = 1.25
+
+
+class NeighborIndex:
+    def __init__(
+        self, centroids, counts, topic_hist, skill_hist, topics, skills, cell_width, rows, cell_budget=0.0, source_digest=''
+    ):
+        self.centroids = np.asarray(centroids, dtype=np.float64)
+        self.counts = np.asarray(counts, dtype=np.uint32)
+        self.topic_hist = np.asarray(topic_hist, dtype=np.uint32)
+        self.skill_hist = np.asarray(skill_hist, dtype=np.uint32)
+        self.topics = np.asarray(topics).astype(str)
+        self.skills = np.asarray(skills).astype(str)
+        self.cell_width = float(cell_width)
+        self.rows = int(rows)
+        self.cell_budget = float(cell_budget)
+        self.source_digest = str(source_digest)
+        self.tree = KDTree(self.centroids) if len(self.centroids) else None
+
+    @classmethod
+    def build(cls, scaled, topic_codes, skill_codes, topics, skills, cell_budget, source_digest=''):
+        scaled = np.asarray(scaled, dtype=np.float64)
+        topic_codes = np.asarray(topic_codes, dtype=np.intp)
+        skill_codes = np.asarray(skill_codes, dtype=np.intp)
+
+        max_cells = max(1, int(np.ceil(cell_budget * np.sqrt(len(scaled)))))
+        cell_width = START_CELL_WIDTH
+        while True:
+            keys = np.floor(scaled / cell_width).astype(np.int64)
+            cells, cell_of_row = np.unique(keys, axis=0, return_inverse=True)
+            if len(cells) <= max_cells:
+                break
+            cell_width *= CELL_WIDTH_GROWTH
+        cell_of_row = cell_of_row.ravel()
+        cell_count = len(cells)
+
+        counts = np.bincount(cell_of_row, minlength=cell_count)
+        centroids = np.column_stack([
+            np.bincount(cell_of_row, weights=scaled[:, dim], minlength=cell_count)
+            for dim in range(scaled.shape[1])
+        ]) / counts[:, None]
+        topic_hist = np.zeros((cell_count, len(topics)), dtype=np.uint32)
+        np.add.at(topic_hist, (cell_of_row, topic_codes), 1)
+        skill_hist = np.zeros((cell_count, len(skills)), dtype=np.uint32)
+        np.add.at(skill_hist, (cell_of_row, skill_codes), 1)
+
+        return cls(
+            centroids=centroids,
+            counts=counts,
+            topic_hist=topic_hist,
+            skill_hist=skill_hist,
+            topics=topics,
+            skills=skills,
+            cell_width=cell_width,
+            rows=len(scaled),
+            cell_budget=cell_budget,
+            source_digest=source_digest,
+        )
+
+    def save(self, path):
+        path.mkdir(parents=True, exist_ok=True)
+        for name in ARRAY_FIELDS:
+            np.save(path / f'{name}.npy', np.ascontiguousarray(getattr(self, name)))
+        meta = {
+            'topics': self.topics.tolist(),
+            'skills': self.skills.tolist(),
+            'cell_width': self.cell_width,
+            'rows': self.rows,
+            'cell_budget': self.cell_budget,
+            'source_digest': self.source_digest,
+        }
+        (path / META_FILE).write_text(json.dumps(meta), encoding='utf-8')
+
+    @classmethod
+    def load(cls, path, mmap_mode='r'):
+        meta = json.loads((path / META_FILE).read_text(encoding='utf-8'))
+        arrays = {name: np.load(path / f'{name}.npy', mmap_mode=mmap_mode, allow_pickle=False) for name in ARRAY_FIELDS}
+        return cls(**arrays, **meta)
+
+    def summarize(self, scaled, n_neighbors=5):
+        scaled = np.atleast_2d(np.asarray(scaled, dtype=np.float64))
+        if self.tree is None:
+            empty = np.zeros((scaled.shape[0], 0))
+            return empty, empty
+
+        nearest_cells = min(n_neighbors, len(self.centroids))
+        _, cells = self.tree.query(scaled, k=nearest_cells)
+        counts = self.counts[cells].astype(np.float64)
+        taken_before = np.cumsum(counts, axis=1) - counts
+        weights = np.clip(n_neighbors - taken_before, 0, counts) / counts
+        topic_counts = np.einsum('rc,rct->rt', weights, self.topic_hist[cells])
+        skill_counts = np.einsum('rc,rcs->rs', weights, self.skill_hist[cells])
+        return topic_counts, skill_counts
+
+    def summary(self, scaled, n_neighbors=5):
+        topic_counts, skill_counts = self.summarize(scaled, n_neighbors)
+        return (
+            {str(self.topics[code]): float(count) for code, count in enumerate(topic_counts[0]) if count > 0},
+            {str(self.skills[code]): float(count) for code, count in enumerate(skill_counts[0]) if count > 0},
+        )
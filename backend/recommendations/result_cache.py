@@ -0,0 +1,76 @@
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+from django.conf import settings
+
+from monitoring.metrics import MetricsStore, record_cache
+
+
+def quantize_total_time(total_time, total_questions):
+    step = settings.RECOMMENDATION_TIME_STEP
+    if step <= 0:
+        return total_time
+    total_questions = np.maximum(total_questions, 1)
+    return np.round(total_time / total_questions / step) * step * total_questions
+
+
+def feature_key(topic, correct_count, total_questions, avg_time, consistency, top_k):
+    return (topic, correct_count, total_questions, round(float(avg_time), 6), round(consistency, 6), top_k)
+
+
+class RecommendationCache:
+    _instance = None
+    _lock = threading.Lock()
+
+    def __init__(self, max_size=None, ttl=None):
+        self.max_size = settings.RECOMMENDATION_CACHE_SIZE if max_size is None else max_size
+        self.ttl = settings.RECOMMENDATION_CACHE_TTL if ttl is None else ttl
+        self.generation = None
+        self.entries = OrderedDict()
+        self.entry_lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls):
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = RecommendationCache()
+        return cls._instance
+
+    def _sync_generation(self, generation):
+        if generation != self.generation:
+            self.entries.clear()
+            self.generation = generation
+
+    def get(self, key, generation):
+        if self.max_size <= 0:
+            return None
+        with self.entry_lock:
+            self._sync_generation(generation)
+            entry = self.entries.get(key)
+            if entry is not None and self.ttl > 0 and time.monotonic() - entry[0] > self.ttl:
+                del self.entries[key]
+                entry = None
+            if entry is not None:
+                self.entries.move_to_end(key)
+            size = len(self.entries)
+        record_cache('recommendations', entry is not None)
+        MetricsStore.get_instance().set_gauge('recommendation_cache_entries', size)
+        return entry[1] if entry is not None else None
+
+    def set(self, key, generation, value):
+        if self.max_size <= 0:
+            return
+        with self.entry_lock:
+            self._sync_generation(generation)
+            self.entries[key] = (time.monotonic(), value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.entry_lock:
+            self.entries.clear()
+            self.generation = None
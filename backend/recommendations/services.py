@@ -1,7 +1,8 @@
 from django.conf import settings
-from learning.models import Course
+from learning import catalog
 from learning.utils import compute_overall_points, streak_ratio
 from .ml_engine import MLService, recommend_courses
+from .result_cache import RecommendationCache, feature_key, quantize_total_time
 
 
 def _level_from_points(overall_points):
@@ -20,17 +21,18 @@ def _content_only_recommend(topic, level, top_k=5):
     }
     target_diff = level_to_diff.get(level, 'easy')
 
-    primary = list(Course.objects.filter(topic__iexact=topic))
-    secondary = list(Course.objects.exclude(topic__iexact=topic))
+    courses = catalog.courses_by_id()
+    primary = [course for course in courses if course['topic'].lower() == topic.lower()]
+    secondary = [course for course in courses if course['topic'].lower() != topic.lower()]
     pool = primary + secondary
 
     def score(course):
         points = 0
         reasons = []
-        if course.topic.lower() == topic.lower():
+        if course['topic'].lower() == topic.lower():
             points += 3
             reasons.append('Matches your selected topic')
-        if course.difficulty == target_diff:
+        if course['difficulty'] == target_diff:
             points += 2
             reasons.append(f'Aligned with your current level ({level})')
         return points, reasons
@@ -40,12 +42,12 @@ def _content_only_recommend(topic, level, top_k=5):
         points, reasons = score(course)
         ranked.append(
             {
-                'id': course.id,
-                'title': course.title,
-                'topic': course.topic,
-                'difficulty': course.difficulty,
-                'description': course.description,
-                'url': course.url,
+                'id': course['id'],
+                'title': course['title'],
+                'topic': course['topic'],
+                'difficulty': course['difficulty'],
+                'description': course['description'],
+                'url': course['url'],
                 'why_recommended': '; '.join(reasons) if reasons else 'Recommended by fallback content matching',
                 '_score': points,
             }
@@ -58,21 +60,39 @@ def _content_only_recommend(topic, level, top_k=5):
     return results
 
 
-def infer_level_and_recommend(topic, correct_count, total_questions, total_time, correctness, top_k=3):
+def learner_features(correct_count, total_questions, total_time, correctness):
     total_questions = max(total_questions, 1)
-    avg_score = (correct_count / total_questions) * 100
-    avg_time = total_time / total_questions
-    consistency = streak_ratio(correctness)
-    overall_points = compute_overall_points(
-        correct_count=correct_count,
-        total_questions=total_questions,
-        total_time=total_time,
-        correctness=correctness,
-        target_time=settings.TARGET_TIME_PER_QUESTION,
-    )
+    total_time = float(quantize_total_time(total_time, total_questions))
+    return {
+        'avg_score': (correct_count / total_questions) * 100,
+        'avg_time': total_time / total_questions,
+        'consistency': streak_ratio(correctness),
+        'overall_points': compute_overall_points(
+            correct_count=correct_count,
+            total_questions=total_questions,
+            total_time=total_time,
+            correctness=correctness,
+            target_time=settings.TARGET_TIME_PER_QUESTION,
+        ),
+    }
+
+
+def infer_level_and_recommend(topic, correct_count, total_questions, total_time, correctness, top_k=3):
+    features = learner_features(correct_count, total_questions, total_time, correctness)
+    avg_score = features['avg_score']
+    avg_time = features['avg_time']
+    consistency = features['consistency']
+    overall_points = features['overall_points']
 
     try:
         ml = MLService.get_instance()
+        result_cache = RecommendationCache.get_instance()
+        key = feature_key(topic, correct_count, total_questions, avg_time, consistency, top_k)
+        generation = (ml.version, ml.forest_digest, ml.knn_digest, catalog.catalog_version())
+        cached = result_cache.get(key, generation)
+        if cached is not None:
+            return cached[0], [dict(item) for item in cached[1]]
+
         level = ml.predict_level(
             avg_score=avg_score,
             avg_time=avg_time,
@@ -89,7 +109,9 @@ def infer_level_and_recommend(topic, correct_count, total_questions, total_time,
             consistency=consistency,
             overall_points=overall_points,
             top_k=top_k,
+            ml=ml,
         )
+        result_cache.set(key, generation, (level, [dict(item) for item in courses]))
     except Exception:
         level = _level_from_points(overall_points)
         courses = _content_only_recommend(topic, level, top_k=top_k)
@@ -0,0 +1,34 @@
+import numpy as np
+from django.test import SimpleTestCase
+
+from recommendations.compiled_forest import COMPILED_MODEL_DIR, CompiledLevelModel
+from recommendations.ml_engine import MLService
+
+
+class CompiledLevelModelTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.ml = MLService()
+        cls.forest = cls.ml.load_random_forest()
+        rng = np.random.default_rng(0)
+        features = cls.ml.scaler.mean_ + cls.ml.scaler.scale_ * rng.standard_normal((2000, cls.ml.scaler.n_features_in_))
+        features[:, -1] = rng.integers(len(cls.ml.topic_encoder.classes_), size=len(features))
+        cls.scaled = cls.ml.scaler.transform(features)
+
+    def test_shipped_model_matches_forest(self):
+        shipped = CompiledLevelModel.load(self.ml.artifact_dir / COMPILED_MODEL_DIR)
+        self.assertEqual(shipped.source_digest, self.ml.forest_digest)
+        np.testing.assert_allclose(shipped.predict_proba(self.scaled), self.forest.predict_proba(self.scaled), atol=1e-12)
+
+    def test_labels_match_forest(self):
+        expected = self.ml.skill_encoder.classes_[self.forest.predict(self.scaled).astype(int)]
+        np.testing.assert_array_equal(self.ml.level_model.predict_scaled(self.scaled), expected)
+
+    def test_predict_level_matches_forest(self):
+        for topic in self.ml.topic_encoder.classes_:
+            for avg_score, avg_time, consistency, overall_points in ((20, 35, 0.2, 15), (65, 20, 0.5, 55), (95, 8, 0.9, 90)):
+                with self.subTest(topic=topic, avg_score=avg_score):
+                    row = [[avg_score, avg_time, consistency, overall_points, self.ml.topic_encoder.transform([topic])[0]]]
+                    expected = self.ml.skill_encoder.classes_[int(self.forest.predict(self.ml.scaler.transform(row))[0])]
+                    self.assertEqual(self.ml.predict_level(avg_score, avg_time, consistency, overall_points, topic), expected)
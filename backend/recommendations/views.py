@@ -3,10 +3,10 @@ from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from learning import catalog
 from learning.models import Course, FinalAssessmentAttempt
-from .models import FeedbackQuestion, FeedbackResponse
+from .models import FeedbackResponse
 from .serializers import (
-    FeedbackQuestionSerializer,
     FeedbackSubmitSerializer,
     FailFeedbackSubmitSerializer,
 )
@@ -23,8 +23,7 @@ FAIL_FEEDBACK_OPTIONS = [
 
 class FeedbackQuestionListView(APIView):
     def get(self, request):
-        questions = FeedbackQuestion.objects.all().order_by('id')
-        return Response(FeedbackQuestionSerializer(questions, many=True).data)
+        return Response(catalog.feedback_questions())
 
 
 class FeedbackSubmitView(APIView):
@@ -0,0 +1,20 @@
+# Generated by Django 5.1.4 on 2026-10-18 01:52
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning', '0006_assessmentattempt_attempt_user_course_fin_idx_and_more'),
+        ('roadmaps', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='airoadmap',
+            index=models.Index(fields=['user', 'course', 'prompt_signature', 'created_at'], name='roadmap_user_course_sig_idx'),
+        ),
+    ]
@@ -14,6 +14,11 @@ class AIRoadmap(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     version = models.CharField(max_length=10, default='v1')
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'course', 'prompt_signature', 'created_at'], name='roadmap_user_course_sig_idx'),
+        ]
+
     def __str__(self):
         return f"Roadmap {self.id} - {self.user.email} - {self.course.title}"
 
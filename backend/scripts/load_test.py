@@ -0,0 +1,409 @@
+import argparse
+import asyncio
+import json
+import random
+import ssl
+import sys
+import time
+from urllib.parse import urlsplit
+
+from api_smoke_test import BASE_URL, ApiError, choose_option, random_email
+
+
+DEFAULT_MIX = 'pass=0.4,fail_retry=0.3,browse=0.3'
+DEFAULT_STAGES = '10s:10,30s:10,5s:0'
+PASSWORD = 'LoadPass123'
+
+
+class HttpConnection:
+    def __init__(self, base_url, timeout):
+        parts = urlsplit(base_url)
+        self.host = parts.hostname
+        self.port = parts.port or (443 if parts.scheme == 'https' else 80)
+        self.ssl = ssl.create_default_context() if parts.scheme == 'https' else None
+        self.prefix = parts.path.rstrip('/')
+        self.timeout = timeout
+        self.reader = None
+        self.writer = None
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except (ConnectionError, OSError):
+                pass
+        self.reader = self.writer = None
+
+    async def _read_body(self, headers):
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            chunks = []
+            while True:
+                size = int((await self.reader.readline()).split(b';')[0].strip() or b'0', 16)
+                if size == 0:
+                    await self.reader.readline()
+                    return b''.join(chunks)
+                chunks.append(await self.reader.readexactly(size))
+                await self.reader.readline()
+        if 'content-length' in headers:
+            return await self.reader.readexactly(int(headers['content-length']))
+        body = await self.reader.read()
+        await self.close()
+        return body
+
+    async def _exchange(self, raw):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port, ssl=self.ssl)
+        self.writer.write(raw)
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionResetError('Connection closed by server.')
+        status = int(status_line.split()[1])
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        body = await self._read_body(headers)
+        if headers.get('connection', '').lower() == 'close':
+            await self.close()
+        return status, body
+
+    async def request(self, method, path, token=None, payload=None):
+        body = json.dumps(payload).encode('utf-8') if payload is not None else b''
+        lines = [
+            f'{method} {self.prefix}{path} HTTP/1.1',
+            f'Host: {self.host}:{self.port}',
+            'Connection: keep-alive',
+            'Accept: application/json',
+            'Content-Type: application/json',
+            f'Content-Length: {len(body)}',
+        ]
+        if token:
+            lines.append(f'Authorization: Bearer {token}')
+        raw = ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body
+
+        for retry in range(2):
+            reused = self.writer is not None
+            try:
+                status, data = await asyncio.wait_for(self._exchange(raw), self.timeout)
+                break
+            except (ConnectionError, asyncio.IncompleteReadError):
+                await self.close()
+                if not reused or retry:
+                    raise
+            except BaseException:
+                await self.close()
+                raise
+
+        text = data.decode('utf-8') if data else ''
+        try:
+            parsed = json.loads(text) if text else {}
+        except json.JSONDecodeError:
+            parsed = {'raw': text[:200]}
+        return status, parsed
+
+
+def percentile(ordered, fraction):
+    if not ordered:
+        return 0.0
+    return ordered[min(int(round(fraction * (len(ordered) - 1))), len(ordered) - 1)]
+
+
+class Stats:
+    def __init__(self):
+        self.latencies = {}
+        self.errors = {}
+        self.journeys = {}
+
+    def record(self, endpoint, elapsed, ok):
+        self.latencies.setdefault(endpoint, []).append(elapsed)
+        if not ok:
+            self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+
+    def journey(self, name, ok):
+        entry = self.journeys.setdefault(name, {'completed': 0, 'failed': 0})
+        entry['completed' if ok else 'failed'] += 1
+
+    def report(self, elapsed, config):
+        endpoints = {}
+        total_requests = 0
+        total_errors = 0
+        for endpoint, values in sorted(self.latencies.items()):
+            ordered = sorted(values)
+            errors = self.errors.get(endpoint, 0)
+            total_requests += len(values)
+            total_errors += errors
+            endpoints[endpoint] = {
+                'count': len(values),
+                'errors': errors,
+                'error_rate': round(errors / len(values), 4),
+                'throughput_rps': round(len(values) / elapsed, 2) if elapsed else 0.0,
+                'mean_ms': round(sum(values) / len(values) * 1000, 2),
+                'p50_ms': round(percentile(ordered, 0.50) * 1000, 2),
+                'p95_ms': round(percentile(ordered, 0.95) * 1000, 2),
+                'p99_ms': round(percentile(ordered, 0.99) * 1000, 2),
+                'max_ms': round(ordered[-1] * 1000, 2),
+            }
+        return {
+            'config': config,
+            'duration_s': round(elapsed, 2),
+            'requests': total_requests,
+            'errors': total_errors,
+            'error_rate': round(total_errors / total_requests, 4) if total_requests else 0.0,
+            'throughput_rps': round(total_requests / elapsed, 2) if elapsed else 0.0,
+            'journeys': self.journeys,
+            'endpoints': endpoints,
+        }
+
+
+class VirtualUser:
+    def __init__(self, connection, stats, interests):
+        self.connection = connection
+        self.stats = stats
+        self.interests = interests
+        self.token = None
+
+    async def call(self, method, path, endpoint=None, payload=None, expect=(200, 201)):
+        started = time.perf_counter()
+        try:
+            status, data = await self.connection.request(method, path, token=self.token, payload=payload)
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError) as exc:
+            self.stats.record(endpoint or f'{method} {path}', time.perf_counter() - started, False)
+            raise ApiError(f'{method} {path} failed: {exc!r}') from exc
+        ok = status in expect
+        self.stats.record(endpoint or f'{method} {path}', time.perf_counter() - started, ok)
+        if not ok:
+            raise ApiError(f'{method} {path} failed with {status}: {data}')
+        return data
+
+    async def sign_up(self):
+        email = random_email().replace('smoke_', 'load_')
+        await self.call('POST', '/auth/register', payload={
+            'name': 'Load Tester',
+            'email': email,
+            'phone_number': '+919876543210',
+            'status': 'Student',
+            'password': PASSWORD,
+            'interests': [item['id'] for item in self.interests[:2]],
+        })
+        login = await self.call('POST', '/auth/login', payload={'email': email, 'password': PASSWORD})
+        self.token = login['access']
+        await self.call('GET', '/auth/me')
+        await self.call('GET', '/dashboard/status')
+
+    async def adaptive_assessment(self):
+        courses = await self.call('GET', '/courses')
+        start = await self.call('POST', '/assessment/start', payload={'selected_course_id': random.choice(courses)['id']})
+        attempt_id = start['attempt_id']
+        question = start['question']
+        for _ in range(30):
+            answer = await self.call('POST', '/assessment/answer', payload={
+                'attempt_id': attempt_id,
+                'question_id': question['id'],
+                'selected_option': choose_option(),
+                'time_spent': random.randint(8, 25),
+            })
+            if answer.get('done'):
+                break
+            question = answer['next_question']
+        else:
+            raise ApiError('Adaptive assessment did not complete within loop guard.')
+
+        for _ in range(20):
+            result = await self.call('GET', f'/result/{attempt_id}', endpoint='GET /result/:attempt_id', expect=(200, 202))
+            if result.get('status') != 'FINALIZING':
+                if not result.get('recommended_courses'):
+                    raise ApiError(f'Attempt {attempt_id} finished without recommended courses.')
+                return result['recommended_courses'][0]['id']
+            await asyncio.sleep(0.5)
+        raise ApiError('Result stayed in FINALIZING.')
+
+    async def final_assessment(self, course_id, path='/final/start'):
+        final = await self.call('POST', path, payload={'course_id': course_id})
+        answers = [{'question_id': item['id'], 'selected_option': choose_option()} for item in final['questions']]
+        return await self.call('POST', '/final/submit', payload={'course_id': course_id, 'answers': answers})
+
+    async def pass_flow(self):
+        await self.sign_up()
+        course_id = await self.adaptive_assessment()
+        submit = await self.final_assessment(course_id)
+        if submit.get('passed'):
+            questions = await self.call('GET', '/feedback/questions')
+            await self.call('POST', '/feedback/submit', payload={
+                'course_id': course_id,
+                'responses': {str(item['id']): (item.get('options') or ['N/A'])[0] for item in questions},
+                'comment': 'Load test feedback submission.',
+            })
+
+    async def fail_retry_flow(self):
+        await self.sign_up()
+        course_id = await self.adaptive_assessment()
+        submit = await self.final_assessment(course_id)
+        if submit.get('passed'):
+            return
+        options = await self.call('GET', '/feedback/fail-options')
+        await self.call('POST', '/feedback/fail-submit', payload={
+            'course_id': course_id,
+            'final_attempt_id': submit['final_attempt_id'],
+            'selected_option': options.get('options', ['Need more practice examples'])[0],
+        })
+        await self.final_assessment(course_id, path='/final/retry')
+
+    async def browse_flow(self):
+        if self.token is None:
+            await self.sign_up()
+        courses = await self.call('GET', '/courses')
+        await self.call('GET', '/dashboard')
+        await self.call('GET', '/dashboard/status')
+        await self.call('GET', '/interests')
+        await self.call('GET', '/feedback/questions')
+        if courses:
+            await self.call(
+                'GET',
+                f"/roadmap/{random.choice(courses)['id']}",
+                endpoint='GET /roadmap/:course_id',
+                expect=(200, 404),
+            )
+
+
+JOURNEYS = {
+    'pass': VirtualUser.pass_flow,
+    'fail_retry': VirtualUser.fail_retry_flow,
+    'browse': VirtualUser.browse_flow,
+}
+
+
+def parse_mix(value):
+    weights = {}
+    for item in value.split(','):
+        name, _, weight = item.partition('=')
+        name = name.strip()
+        if name not in JOURNEYS:
+            raise argparse.ArgumentTypeError(f'Unknown journey "{name}". Choose from {", ".join(JOURNEYS)}.')
+        weights[name] = float(weight or 1)
+    if not weights or sum(weights.values()) <= 0:
+        raise argparse.ArgumentTypeError('Journey mix needs at least one positive weight.')
+    return weights
+
+
+def parse_stages(value):
+    stages = []
+    for item in value.split(','):
+        duration, _, users = item.partition(':')
+        duration = duration.strip().rstrip('s')
+        try:
+            stages.append((float(duration), int(users)))
+        except ValueError as exc:
+            raise argparse.ArgumentTypeError(f'Invalid stage "{item}", expected <seconds>s:<users>.') from exc
+    return stages
+
+
+def target_users(stages, elapsed):
+    previous = 0
+    offset = 0.0
+    for duration, users in stages:
+        if elapsed < offset + duration:
+            progress = (elapsed - offset) / duration if duration else 1.0
+            return int(round(previous + (users - previous) * progress))
+        previous = users
+        offset += duration
+    return None
+
+
+async def run_user(index, args, stats, interests, state):
+    user = VirtualUser(HttpConnection(args.base_url, args.timeout), stats, interests)
+    names = list(args.mix)
+    weights = [args.mix[name] for name in names]
+    try:
+        while not state['stopped']:
+            if index >= state['target']:
+                await asyncio.sleep(0.2)
+                continue
+            name = random.choices(names, weights)[0]
+            try:
+                await JOURNEYS[name](user)
+                stats.journey(name, True)
+            except Exception as exc:
+                stats.journey(name, False)
+                if args.verbose:
+                    print(f'[vu {index}] {name} failed: {exc}', file=sys.stderr)
+                await user.connection.close()
+            if args.think_time:
+                await asyncio.sleep(random.uniform(0, args.think_time))
+    finally:
+        await user.connection.close()
+
+
+async def run(args):
+    bootstrap = HttpConnection(args.base_url, args.timeout)
+    status, interests = await bootstrap.request('GET', '/interests')
+    await bootstrap.close()
+    if status != 200 or len(interests) < 2:
+        raise ApiError('Expected at least 2 interests for registration.')
+
+    stats = Stats()
+    max_users = max(users for _, users in args.stages)
+    state = {'target': 0, 'stopped': False}
+    tasks = [asyncio.create_task(run_user(index, args, stats, interests, state)) for index in range(max_users)]
+
+    started = time.perf_counter()
+    while True:
+        target = target_users(args.stages, time.perf_counter() - started)
+        if target is None:
+            break
+        state['target'] = target
+        await asyncio.sleep(0.1)
+    state['stopped'] = True
+    await asyncio.gather(*tasks, return_exceptions=True)
+    elapsed = time.perf_counter() - started
+
+    config = {
+        'base_url': args.base_url,
+        'mix': args.mix,
+        'stages': [{'duration_s': duration, 'users': users} for duration, users in args.stages],
+        'think_time': args.think_time,
+    }
+    return stats.report(elapsed, config)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run concurrent virtual users against the API and report latency percentiles.')
+    parser.add_argument('--base-url', default=BASE_URL)
+    parser.add_argument('--users', type=int, help='Shortcut for a constant profile: ramp to N users over --ramp-up, hold for --duration.')
+    parser.add_argument('--ramp-up', type=float, default=5.0)
+    parser.add_argument('--duration', type=float, default=30.0)
+    parser.add_argument('--stages', type=parse_stages, default=parse_stages(DEFAULT_STAGES), help='Ramp profile as <seconds>s:<users>,...')
+    parser.add_argument('--mix', type=parse_mix, default=parse_mix(DEFAULT_MIX), help='Journey weights, e.g. pass=0.4,fail_retry=0.3,browse=0.3')
+    parser.add_argument('--think-time', type=float, default=0.0, help='Maximum random pause between journeys in seconds.')
+    parser.add_argument('--timeout', type=float, default=30.0)
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--output', help='Write the JSON report to this file instead of stdout.')
+    parser.add_argument('--verbose', action='store_true')
+    args = parser.parse_args()
+
+    if args.users:
+        args.stages = [(args.ramp_up, args.users), (args.duration, args.users)]
+    random.seed(args.seed)
+
+    report = asyncio.run(run(args))
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as handle:
+            handle.write(output + '\n')
+        print(f"Wrote {report['requests']} requests over {report['duration_s']}s to {args.output}")
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    try:
+        main()
+    except Exception as exc:
+        print(f'LOAD TEST FAILED: {exc}')
+        sys.exit(1)
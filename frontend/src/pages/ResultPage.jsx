@@ -11,16 +11,29 @@ export default function ResultPage() {
   const [openRoadmap, setOpenRoadmap] = useState(null);
 
   useEffect(() => {
+    let cancelled = false;
+    let timer = null;
+
     const loadResult = async () => {
-      if (data) {
+      if (data && data.status !== 'FINALIZING') {
         if (data.recommended_courses?.length) setSelectedCourse(data.recommended_courses[0]);
         return;
       }
       const res = await api.get(`/result/${attemptId}`);
+      if (cancelled) return;
       setData(res.data);
+      if (res.data.status === 'FINALIZING') {
+        timer = setTimeout(loadResult, 1500);
+        return;
+      }
       if (res.data.recommended_courses?.length) setSelectedCourse(res.data.recommended_courses[0]);
     };
     loadResult();
+
+    return () => {
+      cancelled = true;
+      clearTimeout(timer);
+    };
   }, [attemptId]);
 
   if (!data) return <div className="max-w-5xl mx-auto px-4 py-8">Loading result...</div>;
@@ -37,7 +50,8 @@ export default function ResultPage() {
 
         <h2 className="text-2xl font-bold text-slate-900 mt-8">Recommended Courses</h2>
         <div className="mt-4 grid gap-4">
-          {recommendedCourses.length === 0 && <p className="text-slate-700">No recommendation available right now.</p>}
+          {data.status === 'FINALIZING' && <p className="text-slate-700">Preparing your recommendations...</p>}
+          {data.status !== 'FINALIZING' && recommendedCourses.length === 0 && <p className="text-slate-700">No recommendation available right now.</p>}
           {recommendedCourses.map((course) => (
             <div
               key={course.id}
@@ -1,73 +1,119 @@
 import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 import numpy as np
 import pandas as pd
 
 
-def generate_rows(n_samples: int, seed: int):
-    rng = np.random.default_rng(seed)
-    topics = np.array(['Python', 'JavaScript', 'Data Science'])
-
-    rows = []
-    for _ in range(n_samples):
-        topic = rng.choice(topics)
-        base_skill = rng.choice(['Beginner', 'Intermediate', 'Advanced'], p=[0.4, 0.35, 0.25])
-
-        if base_skill == 'Beginner':
-            avg_score = rng.normal(45, 10)
-            avg_time = rng.normal(28, 6)
-            consistency = rng.normal(0.35, 0.15)
-        elif base_skill == 'Intermediate':
-            avg_score = rng.normal(68, 8)
-            avg_time = rng.normal(20, 5)
-            consistency = rng.normal(0.55, 0.12)
-        else:
-            avg_score = rng.normal(86, 7)
-            avg_time = rng.normal(14, 4)
-            consistency = rng.normal(0.75, 0.1)
-
-        avg_score = float(np.clip(avg_score, 5, 100))
-        avg_time = float(np.clip(avg_time, 5, 60))
-        consistency = float(np.clip(consistency, 0, 1))
-
-        time_factor = np.clip(1 - (avg_time / 20.0), 0, 1)
-        overall_points = round(float(70 * (avg_score / 100.0) + 20 * time_factor + 10 * consistency), 2)
-
-        if overall_points < 50:
-            skill_label = 'Beginner'
-        elif overall_points < 75:
-            skill_label = 'Intermediate'
-        else:
-            skill_label = 'Advanced'
-
-        rows.append(
-            {
-                'avg_score': round(avg_score, 2),
-                'avg_time': round(avg_time, 2),
-                'consistency': round(consistency, 4),
-                'overall_points': overall_points,
-                'topic': topic,
-                'skill_label': skill_label,
-            }
-        )
-
-    return pd.DataFrame(rows)
+TOPICS = np.array(['Python', 'JavaScript', 'Data Science'])
+SKILLS = np.array(['Beginner', 'Intermediate', 'Advanced'])
+SKILL_WEIGHTS = [0.4, 0.35, 0.25]
+FEATURE_PARAMS = {
+    'avg_score': (np.array([45.0, 68.0, 86.0]), np.array([10.0, 8.0, 7.0]), 5, 100),
+    'avg_time': (np.array([28.0, 20.0, 14.0]), np.array([6.0, 5.0, 4.0]), 5, 60),
+    'consistency': (np.array([0.35, 0.55, 0.75]), np.array([0.15, 0.12, 0.1]), 0, 1),
+}
+
+
+def generate_chunk(n_samples: int, seed_sequence):
+    rng = np.random.default_rng(seed_sequence)
+    topic = rng.choice(TOPICS, size=n_samples)
+    base_skill = rng.choice(len(SKILLS), size=n_samples, p=SKILL_WEIGHTS)
+
+    features = {}
+    for name, (means, stds, low, high) in FEATURE_PARAMS.items():
+        features[name] = np.clip(rng.normal(means[base_skill], stds[base_skill]), low, high)
+
+    time_factor = np.clip(1 - (features['avg_time'] / 20.0), 0, 1)
+    overall_points = np.round(70 * (features['avg_score'] / 100.0) + 20 * time_factor + 10 * features['consistency'], 2)
+    skill_label = np.select([overall_points < 50, overall_points < 75], ['Beginner', 'Intermediate'], 'Advanced')
+
+    return pd.DataFrame(
+        {
+            'avg_score': np.round(features['avg_score'], 2),
+            'avg_time': np.round(features['avg_time'], 2),
+            'consistency': np.round(features['consistency'], 4),
+            'overall_points': overall_points,
+            'topic': topic,
+            'skill_label': skill_label,
+        }
+    )
+
+
+def _generate_task(task):
+    return generate_chunk(*task)
+
+
+def chunk_tasks(n_samples: int, seed: int, chunk_size: int):
+    sizes = [min(chunk_size, n_samples - start) for start in range(0, n_samples, chunk_size)]
+    return list(zip(sizes, np.random.SeedSequence(seed).spawn(len(sizes))))
+
+
+def generate_chunks(n_samples: int, seed: int, chunk_size: int, workers: int = 1):
+    tasks = chunk_tasks(n_samples, seed, chunk_size)
+    if workers <= 1:
+        for task in tasks:
+            yield _generate_task(task)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for start in range(0, len(tasks), workers):
+            yield from executor.map(_generate_task, tasks[start:start + workers])
+
+
+def generate_rows(n_samples: int, seed: int, chunk_size: int = 1_000_000):
+    return pd.concat(generate_chunks(n_samples, seed, chunk_size), ignore_index=True)
+
+
+def write_csv(chunks, output_file: Path):
+    tmp_path = output_file.with_suffix('.tmp')
+    rows = 0
+    with tmp_path.open('w', newline='', encoding='utf-8') as handle:
+        for index, chunk in enumerate(chunks):
+            chunk.to_csv(handle, index=False, header=index == 0)
+            rows += len(chunk)
+    os.replace(tmp_path, output_file)
+    return rows
+
+
+def write_npz(chunks, output_dir: Path):
+    output_dir.mkdir(parents=True, exist_ok=True)
+    parts = []
+    for index, chunk in enumerate(chunks, start=1):
+        name = f'part-{index:06d}.npz'
+        columns = {column: chunk[column].to_numpy() for column in chunk.columns}
+        np.savez(output_dir / name, **{column: values.astype(str) if values.dtype == object else values for column, values in columns.items()})
+        parts.append({'file': name, 'rows': len(chunk)})
+    state = {'rows': sum(part['rows'] for part in parts), 'parts': parts}
+    (output_dir / 'state.json').write_text(json.dumps(state, indent=2), encoding='utf-8')
+    return state['rows']
 
 
 def main():
     parser = argparse.ArgumentParser(description='Generate synthetic learner history data.')
     parser.add_argument('--samples', type=int, default=400, help='Number of synthetic rows to generate.')
     parser.add_argument('--seed', type=int, default=42, help='Random seed for reproducibility.')
+    parser.add_argument('--chunk-size', type=int, default=1_000_000, help='Rows generated and written per chunk.')
+    parser.add_argument('--workers', type=int, default=1, help='Processes generating chunks in parallel.')
+    parser.add_argument('--format', choices=['csv', 'npz'], default='csv', help='npz writes column parts readable by train_models.py --production-history.')
+    parser.add_argument('--output', type=Path, help='Output file (csv) or directory (npz).')
     args = parser.parse_args()
+    if args.chunk_size <= 0:
+        parser.error('--chunk-size must be positive.')
 
     project_root = Path(__file__).resolve().parents[1]
     dataset_dir = project_root / 'dataset'
     dataset_dir.mkdir(parents=True, exist_ok=True)
 
-    output_file = dataset_dir / 'learner_history.csv'
-    df = generate_rows(args.samples, args.seed)
-    df.to_csv(output_file, index=False)
-    print(f'Generated {len(df)} rows at {output_file}')
+    chunks = generate_chunks(args.samples, args.seed, args.chunk_size, args.workers)
+    if args.format == 'csv':
+        output = args.output or dataset_dir / 'learner_history.csv'
+        rows = write_csv(chunks, output)
+    else:
+        output = args.output or dataset_dir / 'synthetic_history'
+        rows = write_npz(chunks, output)
+    print(f'Generated {rows} rows at {output}')
 
 
 if __name__ == '__main__':
@@ -1,24 +1,182 @@
+import argparse
+import hashlib
+import io
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 import joblib
+import numpy as np
 import pandas as pd
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import LabelEncoder, StandardScaler
-from sklearn.tree import DecisionTreeClassifier
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.neighbors import NearestNeighbors
 from sklearn.metrics import accuracy_score
 
 
+HISTORY_COLUMNS = ['avg_score', 'avg_time', 'consistency', 'overall_points', 'topic', 'skill_label']
+
+
+SELECTION_REPORT = 'model_selection.json'
+_worker_data = {}
+
+
+def parse_grid(value):
+    return [int(item) for item in value.split(',') if item.strip()]
+
+
+def _init_worker(X_train, y_train, X_test, y_test):
+    _worker_data.update(X_train=X_train, y_train=y_train, X_test=X_test, y_test=y_test)
+
+
+def fit_forest(n_estimators, max_depth, X_train, y_train):
+    forest = RandomForestClassifier(n_estimators=n_estimators, max_depth=max_depth, random_state=42, n_jobs=1)
+    return forest.fit(X_train, y_train)
+
+
+def evaluate_candidate(task):
+    n_estimators, max_depth, latency_calls, batch_rows = task
+    X_test = _worker_data['X_test']
+    started = time.perf_counter()
+    forest = fit_forest(n_estimators, max_depth, _worker_data['X_train'], _worker_data['y_train'])
+    fit_seconds = time.perf_counter() - started
+    accuracy = accuracy_score(_worker_data['y_test'], forest.predict(X_test))
+
+    row = X_test[:1]
+    forest.predict(row)
+    single = []
+    for _ in range(latency_calls):
+        started = time.perf_counter()
+        forest.predict(row)
+        single.append(time.perf_counter() - started)
+
+    batch = np.resize(X_test, (batch_rows, X_test.shape[1]))
+    batch_times = []
+    for _ in range(5):
+        started = time.perf_counter()
+        forest.predict(batch)
+        batch_times.append(time.perf_counter() - started)
+
+    buffer = io.BytesIO()
+    joblib.dump(forest, buffer)
+    return {
+        'n_estimators': n_estimators,
+        'max_depth': max_depth,
+        'accuracy': round(float(accuracy), 4),
+        'single_row_ms': round(statistics.median(single) * 1e3, 4),
+        'batch_rows': batch_rows,
+        'batch_ms': round(statistics.median(batch_times) * 1e3, 4),
+        'artifact_bytes': buffer.getbuffer().nbytes,
+        'fit_seconds': round(fit_seconds, 3),
+    }
+
+
+def mark_frontier(candidates):
+    keys = ('accuracy', 'single_row_ms', 'artifact_bytes')
+    for candidate in candidates:
+        candidate['pareto'] = not any(
+            other['accuracy'] >= candidate['accuracy']
+            and other['single_row_ms'] <= candidate['single_row_ms']
+            and other['artifact_bytes'] <= candidate['artifact_bytes']
+            and any(other[key] != candidate[key] for key in keys)
+            for other in candidates
+        )
+    return candidates
+
+
+def select_candidate(candidates, tolerance):
+    best_accuracy = max(candidate['accuracy'] for candidate in candidates)
+    eligible = [candidate for candidate in candidates if candidate['accuracy'] >= best_accuracy - tolerance]
+    return min(eligible, key=lambda item: (item['artifact_bytes'], item['single_row_ms'], -item['accuracy']))
+
+
+def search_forests(X_train, y_train, X_test, y_test, estimators, depths, workers, latency_calls, batch_rows):
+    tasks = [(n_estimators, max_depth, latency_calls, batch_rows) for n_estimators in estimators for max_depth in depths]
+    with ProcessPoolExecutor(
+        max_workers=max(1, workers),
+        initializer=_init_worker,
+        initargs=(X_train, y_train, X_test, y_test),
+    ) as executor:
+        return mark_frontier(list(executor.map(evaluate_candidate, tasks)))
+
+
+def file_digest(path):
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def load_production_history(path):
+    state_path = path / 'state.json'
+    if not state_path.exists():
+        return pd.DataFrame(columns=HISTORY_COLUMNS)
+    state = json.loads(state_path.read_text(encoding='utf-8'))
+    frames = []
+    for part in state['parts']:
+        with np.load(path / part['file'], allow_pickle=False) as columns:
+            frames.append(pd.DataFrame({name: columns[name] for name in HISTORY_COLUMNS}))
+    if not frames:
+        return pd.DataFrame(columns=HISTORY_COLUMNS)
+    return pd.concat(frames, ignore_index=True)
+
+
+def compile_serving_artifacts(root, artifact_dir, df):
+    manage = root / 'backend' / 'manage.py'
+    with tempfile.TemporaryDirectory() as tmp:
+        parity_path = Path(tmp) / 'parity.csv'
+        df[HISTORY_COLUMNS].to_csv(parity_path, index=False)
+        for command in (
+            ['compile_level_model', '--dataset', str(parity_path)],
+            ['build_neighbor_index'],
+        ):
+            subprocess.run([sys.executable, str(manage), *command, '--bundle', str(artifact_dir)], check=True)
+
+
+def publish(artifact_root, version):
+    tmp_path = artifact_root / 'CURRENT.tmp'
+    tmp_path.write_text(version + '\n', encoding='utf-8')
+    os.replace(tmp_path, artifact_root / 'CURRENT')
+
+
 def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--version', default=time.strftime('%Y%m%d-%H%M%S'))
+    parser.add_argument('--no-publish', action='store_true', help='Write the bundle without pointing CURRENT at it.')
+    parser.add_argument('--skip-compile', action='store_true', help='Do not add level_model/ and neighbor_index/ to the bundle.')
+    parser.add_argument('--production-history', type=Path, help='Directory written by the export_learner_history command.')
+    parser.add_argument('--skip-synthetic', action='store_true', help='Train on production history only.')
+    parser.add_argument('--estimators', type=parse_grid, default='25,50,100,200', help='Comma-separated forest sizes to try.')
+    parser.add_argument('--depths', type=parse_grid, default='4,6,8,12', help='Comma-separated maximum depths to try.')
+    parser.add_argument('--accuracy-tolerance', type=float, default=0.005, help='Accept the smallest forest within this accuracy of the best one.')
+    parser.add_argument('--workers', type=int, default=min(4, os.cpu_count() or 1), help='Processes evaluating candidates.')
+    parser.add_argument('--latency-calls', type=int, default=50, help='Single-row predictions timed per candidate.')
+    parser.add_argument('--batch-rows', type=int, default=1000, help='Rows per timed batch prediction.')
+    args = parser.parse_args()
+
     root = Path(__file__).resolve().parents[1]
+    production_path = args.production_history or root / 'dataset' / 'production_history'
     dataset_path = root / 'dataset' / 'learner_history.csv'
-    artifact_dir = root / 'ml' / 'artifacts'
-    artifact_dir.mkdir(parents=True, exist_ok=True)
-
-    if not dataset_path.exists():
-        raise FileNotFoundError(f'Learner history dataset missing: {dataset_path}. Run generate_data.py first.')
+    artifact_root = root / 'ml' / 'artifacts'
+    artifact_dir = artifact_root / 'versions' / args.version
+    if artifact_dir.exists():
+        raise FileExistsError(f'Artifact bundle already exists: {artifact_dir}')
+    artifact_dir.mkdir(parents=True)
 
-    df = pd.read_csv(dataset_path)
+    production = load_production_history(production_path)
+    if args.skip_synthetic:
+        if production.empty:
+            raise FileNotFoundError(f'No production learner history in {production_path}. Run export_learner_history first.')
+        df = production
+    else:
+        if not dataset_path.exists():
+            raise FileNotFoundError(f'Learner history dataset missing: {dataset_path}. Run generate_data.py first.')
+        df = pd.read_csv(dataset_path)[HISTORY_COLUMNS]
+        if not production.empty:
+            df = pd.concat([df, production], ignore_index=True)
 
     topic_encoder = LabelEncoder()
     skill_encoder = LabelEncoder()
@@ -42,29 +200,84 @@ def main():
     X_test_scaled = scaler.transform(X_test)
     X_scaled_full = scaler.transform(X)
 
-    dt = DecisionTreeClassifier(max_depth=5, random_state=42)
-    rf = RandomForestClassifier(n_estimators=200, max_depth=8, random_state=42)
+    candidates = search_forests(
+        X_train_scaled,
+        y_train,
+        X_test_scaled,
+        y_test,
+        args.estimators,
+        args.depths,
+        args.workers,
+        args.latency_calls,
+        args.batch_rows,
+    )
+    selected = select_candidate(candidates, args.accuracy_tolerance)
 
-    dt.fit(X_train_scaled, y_train)
-    rf.fit(X_train_scaled, y_train)
+    rf = fit_forest(selected['n_estimators'], selected['max_depth'], X_train_scaled, y_train)
 
-    dt_acc = accuracy_score(y_test, dt.predict(X_test_scaled))
     rf_acc = accuracy_score(y_test, rf.predict(X_test_scaled))
 
     knn = NearestNeighbors(n_neighbors=5, metric='euclidean')
     knn.fit(X_scaled_full)
 
-    joblib.dump(dt, artifact_dir / 'decision_tree.joblib')
     joblib.dump(rf, artifact_dir / 'random_forest.joblib')
     joblib.dump(knn, artifact_dir / 'knn.joblib')
     joblib.dump(scaler, artifact_dir / 'scaler.joblib')
     joblib.dump(topic_encoder, artifact_dir / 'topic_encoder.joblib')
     joblib.dump(skill_encoder, artifact_dir / 'skill_encoder.joblib')
-    joblib.dump(df[['topic', 'skill_label']], artifact_dir / 'history_meta.joblib')
+    if max(len(topic_encoder.classes_), len(skill_encoder.classes_)) > 256:
+        raise ValueError('History topic and skill codes must fit in uint8.')
+    np.save(artifact_dir / 'history_topic.npy', df['topic_encoded'].to_numpy().astype(np.uint8))
+    np.save(artifact_dir / 'history_skill.npy', y.astype(np.uint8))
+    history_codes = {
+        'topics': topic_encoder.classes_.astype(str).tolist(),
+        'skill_labels': skill_encoder.classes_.astype(str).tolist(),
+    }
+    (artifact_dir / 'history_codes.json').write_text(json.dumps(history_codes), encoding='utf-8')
+    selection_report = {
+        'accuracy_tolerance': args.accuracy_tolerance,
+        'best_accuracy': max(candidate['accuracy'] for candidate in candidates),
+        'selected': {'n_estimators': selected['n_estimators'], 'max_depth': selected['max_depth']},
+        'candidates': sorted(candidates, key=lambda item: (item['n_estimators'], item['max_depth'])),
+    }
+    (artifact_dir / SELECTION_REPORT).write_text(json.dumps(selection_report, indent=2), encoding='utf-8')
+    if not args.skip_compile:
+        compile_serving_artifacts(root, artifact_dir, df)
+
+    manifest = {
+        'version': args.version,
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'dataset_rows': int(len(df)),
+        'production_rows': int(len(production)),
+        'metrics': {
+            'random_forest_accuracy': round(float(rf_acc), 4),
+            'random_forest_estimators': selected['n_estimators'],
+            'random_forest_max_depth': selected['max_depth'],
+            'random_forest_single_row_ms': selected['single_row_ms'],
+            'random_forest_bytes': selected['artifact_bytes'],
+        },
+        'files': {
+            path.relative_to(artifact_dir).as_posix(): file_digest(path)
+            for path in sorted(artifact_dir.rglob('*'))
+            if path.is_file()
+        },
+    }
+    (artifact_dir / 'manifest.json').write_text(json.dumps(manifest, indent=2), encoding='utf-8')
+    if not args.no_publish:
+        publish(artifact_root, args.version)
 
-    print(f'DecisionTree accuracy: {dt_acc:.4f}')
+    for candidate in selection_report['candidates']:
+        marker = '*' if candidate is selected else ('+' if candidate['pareto'] else ' ')
+        print(
+            f"{marker} trees={candidate['n_estimators']:<4} depth={candidate['max_depth']:<3} "
+            f"accuracy={candidate['accuracy']:.4f} single={candidate['single_row_ms']:.3f}ms "
+            f"batch={candidate['batch_ms']:.2f}ms size={candidate['artifact_bytes'] / 1024:.0f}KiB"
+        )
+    print(f"Selected RandomForest: {selected['n_estimators']} trees, max depth {selected['max_depth']} (* selected, + frontier)")
     print(f'RandomForest accuracy: {rf_acc:.4f}')
     print(f'Artifacts saved to: {artifact_dir}')
+    if not args.no_publish:
+        print(f'CURRENT now points to: {args.version}')
 
 
 if __name__ == '__main__':